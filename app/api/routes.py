@@ -3,11 +3,12 @@
 
 import logging
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from app.models.student import Student
 from app.models.user import UserResponse
-from app.services.llm_service import generate_document_list, get_vendor_matches, generate_profile_suggestions
+from app.services.llm_service import generate_document_list, get_vendor_matches, generate_profile_suggestions, stream_profile_suggestions, generate_suggestions_batch, SUGGESTION_BATCH_MAX_PROFILES
 from app.services.s3_service import generate_presigned_url
-from app.services.pincode_service import get_location_from_pincode
+from app.services.pincode_service import get_location_from_pincode_async
 
 from app.utils.validators import validate_email, validate_phone, validate_pincode, validate_cibil_score, validate_pan, validate_aadhaar
 from app.utils.auth import get_current_user
@@ -137,7 +138,7 @@ async def create_student(
         student_dict["created_at"] = datetime.utcnow()
         student_dict["updated_at"] = datetime.utcnow()
         if student.current_location_pincode:
-            location = get_location_from_pincode(student.current_location_pincode)
+            location = await get_location_from_pincode_async(student.current_location_pincode)
             if location:
                 student_dict["current_location_city"] = location["city"]
                 student_dict["current_location_state"] = location["state"]
@@ -252,7 +253,7 @@ async def lookup_pincode(pincode: str):
         if not validate_pincode(pincode):
             logger.warning(f"Invalid pincode format: {pincode}")
             raise HTTPException(status_code=400, detail="Invalid pincode format")
-        location = get_location_from_pincode(pincode)
+        location = await get_location_from_pincode_async(pincode)
         if not location:
             logger.warning(f"Pincode not found: {pincode}")
             raise HTTPException(status_code=404, detail="Pincode not found")
@@ -371,6 +372,43 @@ async def get_profile_suggestions(
         logger.error(f"Error generating profile suggestions: {str(e)}")
         return {"suggestions": []}
 
+
+@router.post("/profile/suggestions/batch")
+async def get_profile_suggestions_batch(
+    students: List[Student],
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Generate AI-powered suggestions for several student profiles with one model call."""
+    logger.info(f"Received POST /api/profile/suggestions/batch for {len(students)} profiles from user: {current_user.email}")
+    if len(students) > SUGGESTION_BATCH_MAX_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {SUGGESTION_BATCH_MAX_PROFILES} profiles per batch"
+        )
+    try:
+        results = generate_suggestions_batch([s.dict(exclude_unset=True) for s in students])
+        logger.info("Batch profile suggestions generated successfully")
+        return {"results": [{"suggestions": suggestions} for suggestions in results]}
+    except Exception as e:
+        logger.error(f"Error generating batch profile suggestions: {str(e)}")
+        return {"results": [{"suggestions": []} for _ in students]}
+
+
+@router.post("/profile/suggestions/stream")
+async def stream_profile_suggestions_endpoint(
+    student: Student,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Stream AI-powered suggestions as NDJSON, one suggestion per line."""
+    logger.info(f"Received POST /api/profile/suggestions/stream from user: {current_user.email}")
+    profile_data = student.dict(exclude_unset=True)
+
+    def ndjson_lines():
+        for suggestion in stream_profile_suggestions(profile_data):
+            yield json.dumps(suggestion) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
 # @router.get("/courses/{course_type}")
 
 # async def get_courses_by_type(course_type: str):
@@ -72,7 +72,7 @@ async def signup(user: UserCreate):
             )
         
         # Generate and send OTP for email verification
-        otp_sent = generate_and_store_otp(user.email, "registration")
+        otp_sent = generate_and_store_otp(user.email, "registration", wait_for_send=False)
         
         if not otp_sent:
             logger.warning(f"Failed to send OTP to {user.email}")
@@ -320,7 +320,7 @@ async def resend_otp(request: ResendOTPRequest):
             )
         
         # Generate and send new OTP
-        success = generate_and_store_otp(request.email, request.purpose)
+        success = generate_and_store_otp(request.email, request.purpose, wait_for_send=False)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -8,6 +8,8 @@ import os
 import logging
 import random
 import string
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,25 @@ SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
 EMAIL_SENDER = os.getenv("EMAIL_SENDER")
 
+# Background senders so HTTP handlers do not wait on the SMTP round-trip
+EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="email")
+
+
+def send_email_in_background(
+    send: Callable[..., bool], *args, on_failure: Optional[Callable[[], None]] = None
+) -> Future:
+    """Run an email send function in the background, calling on_failure if it reports failure."""
+    future = EMAIL_EXECUTOR.submit(send, *args)
+    if on_failure is not None:
+        def _check(done: Future) -> None:
+            if done.exception() is not None or not done.result():
+                try:
+                    on_failure()
+                except Exception as e:
+                    logger.error(f"Email failure handler raised: {e}")
+        future.add_done_callback(_check)
+    return future
+
 
 def send_verification_email(to_email: str, subject: str, body: str) -> bool:
     """Send a verification email via SMTP."""
@@ -1,18 +1,19 @@
 import os
-import json
+import orjson
 import re
+import hashlib
 import logging
 import requests
-from typing import Optional, Tuple, List, Dict
+from typing import Callable, Iterable, Iterator, Optional, Tuple, List, Dict, Set, FrozenSet
 from datetime import datetime
 import time
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import ConnectionFailure, PyMongoError
 from dotenv import load_dotenv
-from collections import OrderedDict
-from functools import lru_cache
-from openai import OpenAI
-from fuzzywuzzy import process
+from openai import APIConnectionError, InternalServerError, OpenAI, RateLimitError
+import redis
+from rapidfuzz import fuzz, process, utils
 
 # Import VENDORS from utils/vendors_list.py
 from ..utils.vendors_list import VENDORS  # Adjusted import path
@@ -37,9 +38,22 @@ CURRENCYLAYER_API_KEY = os.getenv("CURRENCYLAYER_API_KEY")
 EXCHANGE_RATE_URL = "https://api.exchangerate-api.com/v4/latest/USD"
 CURRENCYLAYER_URL = "http://api.currencylayer.com/live"
 
-@lru_cache(maxsize=1)
+# Shared pool for overlapping blocking I/O (exchange-rate fetch) with request work
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-io")
+
+USD_RATE_TTL_SECONDS = 300
+_USD_RATE_CACHE = {"rate": None, "ts": 0.0}
+
 def get_usd_to_inr_rate() -> float:
-    """Fetch real-time USD to INR exchange rate with caching."""
+    """Return the USD to INR exchange rate, refreshing it at most every USD_RATE_TTL_SECONDS."""
+    now = time.monotonic()
+    if _USD_RATE_CACHE["rate"] is None or now - _USD_RATE_CACHE["ts"] >= USD_RATE_TTL_SECONDS:
+        _USD_RATE_CACHE["rate"] = fetch_usd_to_inr_rate()
+        _USD_RATE_CACHE["ts"] = now
+    return _USD_RATE_CACHE["rate"]
+
+def fetch_usd_to_inr_rate() -> float:
+    """Fetch real-time USD to INR exchange rate."""
     try:
         if not EXCHANGE_RATE_API_KEY:
             logger.warning("ExchangeRate-API key missing, using default rate 83.0")
@@ -88,6 +102,148 @@ except ConnectionFailure as e:
     logger.error(f"Failed to connect to MongoDB: {str(e)}")
     universities_collection = None
 
+_UNIVERSITY_NAME_PUNCT_RE = re.compile(r"[^\w\s]")
+
+def normalize_university_name(name: str) -> str:
+    """Normalize a university name for exact indexed lookup (lowercase, no punctuation, single spaces)."""
+    return " ".join(_UNIVERSITY_NAME_PUNCT_RE.sub(" ", name.lower()).split())
+
+def ensure_university_name_index() -> None:
+    """Index universities by normalized name, backfilling documents that lack it. Run once at app startup."""
+    if universities_collection is None:
+        return
+    try:
+        universities_collection.create_index("name_normalized")
+        updates = [
+            UpdateOne({"_id": u["_id"]}, {"$set": {"name_normalized": normalize_university_name(u["name"])}})
+            for u in universities_collection.find({"name_normalized": {"$exists": False}, "name": {"$type": "string"}}, {"name": 1})
+        ]
+        if updates:
+            universities_collection.bulk_write(updates, ordered=False)
+            logger.info(f"Backfilled name_normalized for {len(updates)} universities")
+    except PyMongoError as e:
+        logger.warning(f"Failed to set up university name index: {str(e)}")
+
+# Document checklists used by generate_function_based_document_list
+STUDENT_DOCS_BASE = (
+    "Photograph",
+    "Aadhaar Card",
+    "PAN Card",
+    "Passport",
+    "Offer Letter",
+    "10th/12th Marksheet and Passing Certificate",
+)
+STUDENT_DEGREE_DOC = "Degree Marksheet and Certificate"
+STUDENT_SCORECARD_DOC = "Scorecard (IELTS, TOEFL, GRE, etc., if applicable)"
+STUDENT_DOCS_TAIL = (
+    "Student Email ID and Phone Number",
+    "Bank Statements (Last 6 Months)",
+)
+
+CO_APPLICANT_DOCS_BASE = ("Photograph", "PAN Card", "Aadhaar Card")
+CO_APPLICANT_DOCS_BY_OCCUPATION: Dict[str, Tuple[str, ...]] = {
+    "Salaried": CO_APPLICANT_DOCS_BASE + (
+        "Last 3 Months Salary Slips",
+        "Last 6 Months Bank Statement",
+        "Last 2 Years Form 16",
+        "Utility Bill (e.g., Electricity Bill)",
+        "Rent Agreement (if applicable)",
+        "Co-Applicant Phone Number and Email ID",
+    ),
+    "Self-Employed": CO_APPLICANT_DOCS_BASE + (
+        "GST 3B Last 1 Year and GST Certificate (Merged PDF)",
+        "ITR of Last 2 Years with Computation Page",
+        "Current Account Statement (Last 6 Months)",
+        "Savings Account Statement (Last 6 Months)",
+        "Audit Report of Last 2 Years",
+        "Utility Bill (e.g., Electricity Bill)",
+        "Co-Applicant Phone Number and Email ID",
+    ),
+    "Farmer": CO_APPLICANT_DOCS_BASE + (
+        "Land Ownership Documents",
+        "Last 6 Months Bank Statement",
+        "Utility Bill (e.g., Electricity Bill)",
+        "Co-Applicant Phone Number and Email ID",
+    ),
+}
+CO_APPLICANT_DOCS_OTHER = CO_APPLICANT_DOCS_BASE + (
+    "Last 6 Months Bank Statement (if applicable)",
+    "Utility Bill (e.g., Electricity Bill)",
+    "Co-Applicant Phone Number and Email ID",
+)
+
+PROPERTY_DOCS = (
+    "Complete Registered Agreement",
+    "Index 2",
+    "Title Deed",
+    "Sale Deed",
+    "Sanctioned Plan (Blueprint)",
+    "Non-Agricultural Order",
+)
+PROPERTY_OWNER_DOCS = ("PAN Card", "Aadhaar Card")
+COLLATERAL_DOCS: Dict[str, Tuple[str, ...]] = {
+    "Residential": PROPERTY_DOCS,
+    "Commercial": PROPERTY_DOCS,
+    "FD": (
+        "Fixed Deposit Receipt",
+        "Bank Statement showing FD",
+        "FD Holder's PAN Card",
+        "FD Holder's Aadhaar Card",
+    ),
+}
+
+def normalize_vendor_name(name: str) -> str:
+    """Normalize a vendor name for case- and hyphen-insensitive comparison."""
+    return name.lower().replace("-", "")
+
+def get_normalized_vendor_name(vendor: Dict) -> str:
+    """Return the precomputed normalized vendor name, computing it for ad-hoc vendor dicts."""
+    return vendor.get("_name_norm") or normalize_vendor_name(vendor.get("vendorName", ""))
+
+def normalize_course_type(course_type: str) -> str:
+    """Normalize a course type (e.g. "Non-STEM") for case- and hyphen-insensitive comparison."""
+    return course_type.replace("-", "").lower()
+
+def build_supported_courses_norm(vendor: Dict) -> FrozenSet[str]:
+    """Build the set of normalized course types a vendor supports."""
+    return frozenset(normalize_course_type(c) for c in vendor.get("criteria", {}).get("supported_courses", []))
+
+def get_supported_courses_norm(vendor: Dict) -> FrozenSet[str]:
+    """Return the precomputed normalized supported courses, computing them for ad-hoc vendor dicts."""
+    supported_courses = vendor.get("_supported_courses_norm")
+    return supported_courses if supported_courses is not None else build_supported_courses_norm(vendor)
+
+# Normalize catalog vendor names and course lists once at load time instead of per request
+for _vendor in VENDORS:
+    _vendor["_name_norm"] = normalize_vendor_name(_vendor["vendorName"])
+    _vendor["_supported_courses_norm"] = build_supported_courses_norm(_vendor)
+
+# Vendors that lend regardless of the university's vendor list
+NO_UNIVERSITY_LIST_VENDORS = frozenset({"HDFC Credila", "Auxilo", "Avanse", "Tata Capital", "InCred"})
+
+# Bitmap index over VENDORS: bit i stands for VENDORS[i]
+_VENDOR_NAME_NORM_BITS: Dict[str, int] = {}
+NO_UNIVERSITY_LIST_VENDOR_BITS = 0
+for _i, _vendor in enumerate(VENDORS):
+    _VENDOR_NAME_NORM_BITS[_vendor["_name_norm"]] = _VENDOR_NAME_NORM_BITS.get(_vendor["_name_norm"], 0) | (1 << _i)
+    if _vendor["vendorName"] in NO_UNIVERSITY_LIST_VENDORS:
+        NO_UNIVERSITY_LIST_VENDOR_BITS |= 1 << _i
+
+def select_catalog_vendors(university_vendors_norm: Set[str]) -> List[Dict]:
+    """Return catalog vendors that are university-independent or listed for the university, in catalog order."""
+    mask = NO_UNIVERSITY_LIST_VENDOR_BITS
+    for name_norm in university_vendors_norm:
+        mask |= _VENDOR_NAME_NORM_BITS.get(name_norm, 0)
+    selected = []
+    while mask:
+        lowest = mask & -mask
+        selected.append(VENDORS[lowest.bit_length() - 1])
+        mask ^= lowest
+    return selected
+
+# Admission statuses that count as holding an admission letter
+ADMISSION_LETTER_STATUSES = frozenset({"Admission letter received", "Conditional letter received"})
+
 def format_amount(amount: float) -> str:
     """Format amount with commas and approximate in words if large."""
     if amount is None or amount == 0:
@@ -148,8 +304,8 @@ def validate_profile(profile: Dict) -> Dict:
     }
     
     # admission_status
-    valid_statuses = ["Admission letter received", "Conditional letter received", ""]
-    validated["education_details"]["admission_status"] = validated["education_details"].get("admission_status", "") if validated["education_details"].get("admission_status", "") in valid_statuses else ""
+    admission_status = validated["education_details"].get("admission_status", "")
+    validated["education_details"]["admission_status"] = admission_status if admission_status in ADMISSION_LETTER_STATUSES else ""
     
     # test scores
     english_test = validated["education_details"].get("english_test", {})
@@ -532,33 +688,42 @@ def check_admission_status_eligibility(vendor: Dict, admission_status: str, engl
     requires_admission = criteria.get("requires_admission")
     
     if isinstance(requires_admission, bool):
-        if requires_admission and admission_status not in ["Admission letter received", "Conditional letter received"]:
+        if requires_admission and admission_status not in ADMISSION_LETTER_STATUSES:
             return False
     elif isinstance(requires_admission, list):
         requires_letter = any(
             entry.get("Admission Letter") or entry.get("Conditional Admission")
             for entry in requires_admission
         )
-        if requires_letter and admission_status not in ["Admission letter received", "Conditional letter received"]:
+        if requires_letter and admission_status not in ADMISSION_LETTER_STATUSES:
             return False
     
     return True
 
-def calculate_vendor_score(vendor: Dict, student_profile: Dict, loan_preference: str, university_vendors: List[str], no_university_vendors: bool, foir_results: Dict) -> int:
-    """Calculate matching score for a vendor based on various criteria."""
-    vendor_name = vendor.get("vendorName")
-    criteria = vendor.get("criteria", {})
-    score = 0
-    
+# Sum of all rule weights in the vendor scorer
+MAX_VENDOR_SCORE = 98
+# Minimum score for a vendor to be returned as a match
+MIN_MATCH_SCORE = 50
+
+def build_vendor_scorer(student_profile: Dict, university_vendors_norm: Set[str]) -> Callable[[Dict, str, Dict, int], int]:
+    """Resolve the student-side scoring inputs once and return a per-vendor scoring function.
+
+    The returned ``score_vendor(vendor, loan_preference, foir_result, min_score=0)``
+    applies the vendor rules against these precomputed values. ``university_vendors_norm``
+    holds the university's vendor names already passed through ``normalize_vendor_name``;
+    ``foir_result`` is the vendor's FOIR outcome for ``loan_preference``. When the points
+    still available can no longer lift the running total to ``min_score``, the partial
+    score is returned early.
+    """
     # Extract profile details
     education_details = student_profile.get("education_details", {})
     loan_details = student_profile.get("loan_details", {})
     co_applicant_details = student_profile.get("co_applicant_details", {})
-    
-    university = education_details.get("university_name", [""])[0] if isinstance(education_details.get("university_name"), list) else ""
+
     country = education_details.get("study_destination_country", [""])[0] if isinstance(education_details.get("study_destination_country"), list) else ""
-    course_type = education_details.get("course_type", "").replace("-", "")
+    course_type = normalize_course_type(education_details.get("course_type", ""))
     admission_status = education_details.get("admission_status", "")
+    has_admission_letter = admission_status in ADMISSION_LETTER_STATUSES
     academic_score = education_details.get("academic_score", {}).get("value", 0)
     if academic_score == 0:
         academic_score = education_details.get("marks_12th", {}).get("value", education_details.get("marks_10th", {}).get("value", 0))
@@ -567,107 +732,152 @@ def calculate_vendor_score(vendor: Dict, student_profile: Dict, loan_preference:
     cibil_score = loan_details.get("cibil_score", "None")
     co_applicant_occupation = co_applicant_details.get("co_applicant_occupation", "")
     co_applicant_income = co_applicant_details.get("co_applicant_income_amount", {}).get("amount", 0) if isinstance(co_applicant_details.get("co_applicant_income_amount"), dict) else 0
+    monthly_income = co_applicant_income / 12 if co_applicant_income > 0 else 0
+    foir_limit = 75 if monthly_income >= 100000 else 60
     collateral_available = loan_details.get("collateral_available") == "Yes"
     co_applicant_available = loan_details.get("co_applicant_available") == "Yes"
     english_test = education_details.get("english_test", {})
+    english_test_type = english_test.get("type") if isinstance(english_test, dict) else None
+    english_test_score = english_test.get("score") if isinstance(english_test, dict) else None
     standardized_test = education_details.get("standardized_test", {})
-    bank_balance = co_applicant_details.get("bank_balance", False)
-    
+
     # Loan amount
     loan_amount_dict = loan_details.get("loan_amount_requested", education_details.get("loan_amount_requested", {}))
     loan_amount = loan_amount_dict.get("amount", 0) if isinstance(loan_amount_dict, dict) else 0
-    
-    # University Vendor List (20 points)
-    no_university_list_vendors = ["HDFC Credila", "Auxilo", "Avanse", "Tata Capital", "InCred"]
-    if vendor_name in no_university_list_vendors or any(vendor_name.lower().replace("-", "") == uv.lower().replace("-", "") for uv in university_vendors):
-        score += 20
-    
-    # Loan Amount after FOIR (15 points)
-    foir_result = foir_results.get((vendor_name, loan_preference), {})
-    adjusted_loan = foir_result.get("adjusted_loan", loan_amount)
-    if adjusted_loan == loan_amount:
-        score += 15
-    elif adjusted_loan > 0 and abs(adjusted_loan - loan_amount) / loan_amount <= 0.1:
-        score += 7
-    
-    # Supported Country (10 points)
-    if check_country_eligibility(vendor, country):
-        score += 10
-    
-    # Supported Course Type (10 points)
-    supported_courses = [c.replace("-", "") for c in criteria.get("supported_courses", [])]
-    if not supported_courses or course_type.lower() in [sc.lower() for sc in supported_courses]:
-        score += 10
-    
-    # Collateral (8 points)
-    if collateral_available and loan_preference == "Secured":
-        score += 8
-    
-    # Loan Type (7 points)
-    if check_loan_type_eligibility(vendor, loan_preference):
-        if loan_preference == "Secured" and collateral_available:
-            score += 7
-        elif loan_preference == "Unsecured":
+
+    def score_vendor(vendor: Dict, loan_preference: str, foir_result: Dict, min_score: int = 0) -> int:
+        vendor_name = vendor.get("vendorName")
+        criteria = vendor.get("criteria", {})
+        score = 0
+        remaining = MAX_VENDOR_SCORE
+
+        # University Vendor List (20 points)
+        if vendor_name in NO_UNIVERSITY_LIST_VENDORS or get_normalized_vendor_name(vendor) in university_vendors_norm:
+            score += 20
+        remaining -= 20
+        if score + remaining < min_score:
+            return score
+
+        # Loan Amount after FOIR (15 points)
+        adjusted_loan = foir_result.get("adjusted_loan", loan_amount)
+        if adjusted_loan == loan_amount:
+            score += 15
+        elif adjusted_loan > 0 and abs(adjusted_loan - loan_amount) / loan_amount <= 0.1:
             score += 7
-    
-    # Admission Status (5 points)
-    if vendor_name == "HDFC Credila":
-        score += 5
-    elif check_admission_status_eligibility(vendor, admission_status, english_test, standardized_test):
-        if admission_status in ["Admission letter received", "Conditional letter received"]:
+        remaining -= 15
+        if score + remaining < min_score:
+            return score
+
+        # Supported Country (10 points)
+        if check_country_eligibility(vendor, country):
+            score += 10
+        remaining -= 10
+        if score + remaining < min_score:
+            return score
+
+        # Supported Course Type (10 points)
+        supported_courses = get_supported_courses_norm(vendor)
+        if not supported_courses or course_type in supported_courses:
+            score += 10
+        remaining -= 10
+        if score + remaining < min_score:
+            return score
+
+        # Collateral (8 points)
+        if collateral_available and loan_preference == "Secured":
+            score += 8
+        remaining -= 8
+        if score + remaining < min_score:
+            return score
+
+        # Loan Type (7 points)
+        if check_loan_type_eligibility(vendor, loan_preference):
+            if loan_preference == "Secured" and collateral_available:
+                score += 7
+            elif loan_preference == "Unsecured":
+                score += 7
+        remaining -= 7
+        if score + remaining < min_score:
+            return score
+
+        # Admission Status (5 points)
+        if vendor_name == "HDFC Credila":
             score += 5
-    
-    # Co-Applicant Salaried (3 points)
-    if co_applicant_available and criteria.get("requires_co_applicant") and co_applicant_occupation == "Salaried":
-        score += 3
-    
-    # FOIR Score (2 points)
-    foir_value = foir_result.get("foir", 0)
-    monthly_income = co_applicant_income / 12 if co_applicant_income > 0 else 0
-    foir_limit = 75 if monthly_income >= 100000 else 60
-    if foir_value <= foir_limit:
-        score += 2
-    
-    # Academic Score (5 points)
-    min_academic_score = criteria.get("min_academic_score_percentage")
-    if min_academic_score is None or (isinstance(academic_score, (int, float)) and academic_score >= min_academic_score):
-        score += 5
-    
-    # English Test Score (3 points)
-    english_test_type = english_test.get("type") if isinstance(english_test, dict) else None
-    english_test_score = english_test.get("score") if isinstance(english_test, dict) else None
-    if english_test_score is not None:
-        min_ielts = criteria.get("min_ielts_score")
-        min_toefl = criteria.get("min_toefl_score")
-        if english_test_type == "IELTS" and (min_ielts is None or english_test_score >= min_ielts):
+        elif check_admission_status_eligibility(vendor, admission_status, english_test, standardized_test):
+            if has_admission_letter:
+                score += 5
+        remaining -= 5
+        if score + remaining < min_score:
+            return score
+
+        # Co-Applicant Salaried (3 points)
+        if co_applicant_available and criteria.get("requires_co_applicant") and co_applicant_occupation == "Salaried":
             score += 3
-        elif english_test_type == "TOEFL" and (min_toefl is None or english_test_score >= min_toefl):
+        remaining -= 3
+        if score + remaining < min_score:
+            return score
+
+        # FOIR Score (2 points)
+        if foir_result.get("foir", 0) <= foir_limit:
+            score += 2
+        remaining -= 2
+        if score + remaining < min_score:
+            return score
+
+        # Academic Score (5 points)
+        min_academic_score = criteria.get("min_academic_score_percentage")
+        if min_academic_score is None or (isinstance(academic_score, (int, float)) and academic_score >= min_academic_score):
+            score += 5
+        remaining -= 5
+        if score + remaining < min_score:
+            return score
+
+        # English Test Score (3 points)
+        if english_test_score is not None:
+            min_ielts = criteria.get("min_ielts_score")
+            min_toefl = criteria.get("min_toefl_score")
+            if english_test_type == "IELTS" and (min_ielts is None or english_test_score >= min_ielts):
+                score += 3
+            elif english_test_type == "TOEFL" and (min_toefl is None or english_test_score >= min_toefl):
+                score += 3
+        elif not criteria.get("min_ielts_score") and not criteria.get("min_toefl_score"):
             score += 3
-    elif not criteria.get("min_ielts_score") and not criteria.get("min_toefl_score"):
-        score += 3
-    
-    # Standardized Test Score (2 points)
-    
-    
-    # Backlogs (5 points)
-    max_backlogs = criteria.get("max_educational_backlogs")
-    if max_backlogs is None or backlogs <= max_backlogs:
-        score += 5
-    
-    # Age (2 points)
-    max_age = criteria.get("max_student_age")
-    if max_age is None or (age and age <= max_age):
-        score += 2
-    
-    # Margin Money (2 points) - assuming met if not specified
-    if not criteria.get("margin_money_percentage") or criteria.get("margin_money_percentage") == 0:
-        score += 2
-    
-    # CIBIL Score (1 point)
-    if check_cibil_eligibility(vendor, cibil_score):
-        score += 1
-    
-    return score
+        remaining -= 3
+        if score + remaining < min_score:
+            return score
+
+        # Standardized Test Score (2 points) - not scored yet
+
+        # Backlogs (5 points)
+        max_backlogs = criteria.get("max_educational_backlogs")
+        if max_backlogs is None or backlogs <= max_backlogs:
+            score += 5
+        remaining -= 5
+        if score + remaining < min_score:
+            return score
+
+        # Age (2 points)
+        max_age = criteria.get("max_student_age")
+        if max_age is None or (age and age <= max_age):
+            score += 2
+        remaining -= 2
+        if score + remaining < min_score:
+            return score
+
+        # Margin Money (2 points) - assuming met if not specified
+        if not criteria.get("margin_money_percentage") or criteria.get("margin_money_percentage") == 0:
+            score += 2
+        remaining -= 2
+        if score + remaining < min_score:
+            return score
+
+        # CIBIL Score (1 point)
+        if check_cibil_eligibility(vendor, cibil_score):
+            score += 1
+
+        return score
+
+    return score_vendor
 
 def perform_strict_matching(vendors: List[Dict], student_profile: Dict, loan_amount: float, loan_types: List[str]) -> List[Tuple[Dict, str]]:
     """Perform strict matching based on mandatory criteria."""
@@ -694,7 +904,7 @@ def perform_strict_matching(vendors: List[Dict], student_profile: Dict, loan_amo
     standardized_test = education_details.get("standardized_test", {})
     
     for loan_preference in loan_types:
-        logger.info(f"### Evaluating {loan_preference} Loans")
+        logger.info("### Evaluating %s Loans", loan_preference)
         
         # Filter vendors by country and geo restrictions
         filtered_vendors = []
@@ -702,11 +912,11 @@ def perform_strict_matching(vendors: List[Dict], student_profile: Dict, loan_amo
             vendor_name = vendor.get("vendorName")
             
             if not check_country_eligibility(vendor, country):
-                logger.info(f"Vendor {vendor_name} filtered: country not supported")
+                logger.info("Vendor %s filtered: country not supported", vendor_name)
                 continue
             
             if not check_geo_restrictions(vendor, geo_state):
-                logger.info(f"Vendor {vendor_name} filtered: geo restrictions")
+                logger.info("Vendor %s filtered: geo restrictions", vendor_name)
                 continue
             
             filtered_vendors.append(vendor)
@@ -718,91 +928,122 @@ def perform_strict_matching(vendors: List[Dict], student_profile: Dict, loan_amo
             is_eligible = True
             effective_loan_type = loan_preference
             
-            logger.info(f"{vendor_name}:")
+            logger.info("%s:", vendor_name)
             
             # Degree check
             if not check_degree_eligibility(vendor, intended_degree):
                 reasons.append(f"Intended degree {intended_degree} not supported")
                 is_eligible = False
-                logger.info(f"  - Supported Degree: No")
+                logger.info("  - Supported Degree: No")
             else:
-                logger.info(f"  - Supported Degree: Yes")
+                logger.info("  - Supported Degree: Yes")
             
             # Loan amount check
             amount_eligible, effective_type, amount_message = check_loan_amount_eligibility(vendor, loan_amount, loan_preference)
             if not amount_eligible:
                 reasons.append(amount_message)
                 is_eligible = False
-                logger.info(f"  - Loan Amount: {amount_message}")
+                logger.info("  - Loan Amount: %s", amount_message)
             else:
                 effective_loan_type = effective_type
-                logger.info(f"  - Loan Amount: {amount_message}")
+                logger.info("  - Loan Amount: %s", amount_message)
                 
                 # Special case: if collateral value is less than loan amount, switch to unsecured
                 if (loan_preference == "Secured" and collateral_existing_loan and 
                     collateral_value and loan_amount < collateral_value):
                     effective_loan_type = "Unsecured"
-                    logger.info(f"  - Adjusted to Unsecured due to collateral value")
+                    logger.info("  - Adjusted to Unsecured due to collateral value")
             
             # CIBIL score check
             if not check_cibil_eligibility(vendor, cibil_score):
                 reasons.append(f"CIBIL score {cibil_score} does not meet requirements")
                 is_eligible = False
-                logger.info(f"  - CIBIL Score: Does not meet requirement")
+                logger.info("  - CIBIL Score: Does not meet requirement")
             else:
-                logger.info(f"  - CIBIL Score: Meets requirement")
+                logger.info("  - CIBIL Score: Meets requirement")
             
             # Loan type check
             if not check_loan_type_eligibility(vendor, effective_loan_type):
                 reasons.append(f"Loan preference {effective_loan_type} not supported")
                 is_eligible = False
-                logger.info(f"  - Loan Preference: Does not match {effective_loan_type.lower()}")
+                logger.info("  - Loan Preference: Does not match %s", effective_loan_type.lower())
             else:
-                logger.info(f"  - Loan Preference: Matches {effective_loan_type.lower()}")
+                logger.info("  - Loan Preference: Matches %s", effective_loan_type.lower())
             
             # Co-applicant check
             if not check_co_applicant_eligibility(vendor, co_applicant_available, co_applicant_relation):
                 reasons.append("Co-applicant requirements not met")
                 is_eligible = False
-                logger.info(f"  - Co-Applicant: Requirements not met")
+                logger.info("  - Co-Applicant: Requirements not met")
             else:
-                logger.info(f"  - Co-Applicant: {'Available' if co_applicant_available else 'Not required'}")
+                logger.info("  - Co-Applicant: %s", "Available" if co_applicant_available else "Not required")
             
             # Collateral check
             if not check_collateral_eligibility(vendor, effective_loan_type, collateral_available):
                 reasons.append("Collateral required but not available")
                 is_eligible = False
-                logger.info(f"  - Collateral: Required but not available")
+                logger.info("  - Collateral: Required but not available")
             else:
-                logger.info(f"  - Collateral: {'Available' if collateral_available else 'Not required'}")
+                logger.info("  - Collateral: %s", "Available" if collateral_available else "Not required")
             
             # Own house check
             if not check_own_house_requirement(vendor, own_house):
                 reasons.append("Own house required but not provided")
                 is_eligible = False
-                logger.info(f"  - Own House: Required but not provided")
+                logger.info("  - Own House: Required but not provided")
             else:
-                logger.info(f"  - Own House: Requirement satisfied")
+                logger.info("  - Own House: Requirement satisfied")
             
             # Admission status check
             if not check_admission_status_eligibility(vendor, admission_status, english_test, standardized_test):
                 reasons.append("Admission status or test scores do not meet requirements")
                 is_eligible = False
-                logger.info(f"  - Admission Status: Requirements not met")
+                logger.info("  - Admission Status: Requirements not met")
             else:
-                logger.info(f"  - Admission Status: Requirements met")
+                logger.info("  - Admission Status: Requirements met")
             
             if is_eligible:
                 key = (vendor_name, effective_loan_type)
                 if key not in seen:
                     seen.add(key)
                     eligible_vendors.append((vendor, effective_loan_type))
-                    logger.info(f"  - Match: Yes")
+                    logger.info("  - Match: Yes")
             else:
-                logger.info(f"  - Match: No ({', '.join(reasons)})")
+                logger.info("  - Match: No (%s)", ", ".join(reasons))
     
     return eligible_vendors
 
+def lookup_university_vendors(university: str) -> Set[str]:
+    """Return the vendors for a university, trying an exact normalized-name match before fuzzy matching."""
+    # Exact lookup on the indexed normalized name covers the common case
+    uni_doc = universities_collection.find_one({"name_normalized": normalize_university_name(university)}, {"vendors": 1})
+    if uni_doc and uni_doc.get("vendors"):
+        logger.info(f"Found exact university match for '{university}'")
+        return set(uni_doc["vendors"])
+
+    # Fetch all university names and their vendors in one query for fuzzy matching
+    university_vendor_map = {}
+    for u in universities_collection.find({}, {'name': 1, 'vendors': 1}):
+        university_vendor_map.setdefault(u['name'], u.get('vendors'))
+    
+    # Find similar universities with a score >= 90
+    similar_universities = process.extract(
+        university,
+        list(university_vendor_map),
+        scorer=fuzz.WRatio,
+        processor=utils.default_process,
+        score_cutoff=90,
+        limit=None
+    )
+    
+    combined_vendors = set()
+    for uni_name, score, _ in similar_universities:
+        logger.info("Found similar university: %s with score %s", uni_name, score)
+        uni_vendors = university_vendor_map[uni_name]
+        if uni_vendors:
+            combined_vendors.update(uni_vendors)
+    return combined_vendors
+
 def get_function_based_vendor_matches(student_profile: Dict, vendors: Optional[List[Dict]] = None) -> Tuple[List[Dict], Optional[str]]:
     """Match student profile with university-specific vendors using function-based logic."""
     try:
@@ -829,38 +1070,31 @@ def get_function_based_vendor_matches(student_profile: Dict, vendors: Optional[L
         collateral_available = loan_details.get("collateral_available") == "Yes"
         co_applicant_available = loan_details.get("co_applicant_available") == "Yes"
 
-        # Vendors ignoring university list
-        NO_UNIVERSITY_LIST_VENDORS = ["HDFC Credila", "Auxilo", "Avanse", "Tata Capital", "InCred"]
+        # Start the exchange-rate fetch now so it overlaps with the university lookup
+        loan_currency = loan_details.get("loan_amount_requested", {}).get("currency")
+        rate_future = IO_EXECUTOR.submit(get_usd_to_inr_rate) if loan_currency == "USD" else None
 
         valid_vendors = VENDORS if vendors is None else vendors
         no_university_vendors = False
         university_vendors = []
+        university_vendors_norm = set()
         
         if university and universities_collection is not None:
             try:
-                # Fetch all university names from the database for fuzzy matching
-                all_universities = [u['name'] for u in universities_collection.find({}, {'name': 1})]
-                
-                # Find similar universities with a score >= 80
-                similar_universities = process.extract(university, all_universities, limit=None)
-                
-                combined_vendors = set()
-                
-                for uni_name, score in similar_universities:
-                    if score >= 90:
-                        logger.info(f"Found similar university: {uni_name} with score {score}")
-                        uni_doc = universities_collection.find_one({"name": uni_name})
-                        if uni_doc and "vendors" in uni_doc and uni_doc["vendors"]:
-                            combined_vendors.update(uni_doc["vendors"])
+                combined_vendors = lookup_university_vendors(university)
 
                 if combined_vendors:
                     university_vendors = list(combined_vendors)
+                    university_vendors_norm = {normalize_vendor_name(uv) for uv in university_vendors}
                     logger.info(f"Found vendors for university '{university}' and similar ones: {university_vendors}")
-                    valid_vendors = [
-                        v for v in valid_vendors
-                        if v["vendorName"] in NO_UNIVERSITY_LIST_VENDORS or
-                        any(v["vendorName"].lower().replace("-", "") == uv.lower().replace("-", "") for uv in university_vendors)
-                    ]
+                    if vendors is None:
+                        valid_vendors = select_catalog_vendors(university_vendors_norm)
+                    else:
+                        valid_vendors = [
+                            v for v in valid_vendors
+                            if v["vendorName"] in NO_UNIVERSITY_LIST_VENDORS or
+                            get_normalized_vendor_name(v) in university_vendors_norm
+                        ]
                     logger.info(f"Filtered to {len(valid_vendors)} university-specific vendors: {[v['vendorName'] for v in valid_vendors]}")
                 else:
                     logger.warning(f"No vendors found for university '{university}' or similar in MongoDB; using all vendors with exemptions")
@@ -890,7 +1124,7 @@ def get_function_based_vendor_matches(student_profile: Dict, vendors: Optional[L
             loan_amount = float(raw_amount)
             
             if currency == "USD":
-                exchange_rate = get_usd_to_inr_rate()
+                exchange_rate = rate_future.result() if rate_future is not None else get_usd_to_inr_rate()
                 loan_amount *= exchange_rate
                 logger.info(f"Converted USD {raw_amount} to INR {loan_amount:.2f} (rate: {exchange_rate})")
             
@@ -904,17 +1138,19 @@ def get_function_based_vendor_matches(student_profile: Dict, vendors: Optional[L
         
         # Perform strict matching
         eligible_vendors = perform_strict_matching(valid_vendors, student_profile, loan_amount, loan_types)
-        logger.info(f"Eligible vendors after strict matching: {len(eligible_vendors)} - {[(v['vendorName'], lp) for v, lp in eligible_vendors]}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Eligible vendors after strict matching: %d - %s", len(eligible_vendors), [(v['vendorName'], lp) for v, lp in eligible_vendors])
 
         # Calculate FOIR for all eligible vendors
-        logger.info(f"### Step 2: FOIR Calculation")
-        foir_results = {}
+        logger.info("### Step 2: FOIR Calculation")
+        # One result per eligible vendor, in the same order as eligible_vendors
+        foir_results = []
+        # FOIR limit depends only on the student, so resolve it once for all vendors
+        co_applicant_income = co_applicant_details.get("co_applicant_income_amount", {}).get("amount", 0)
+        monthly_income = co_applicant_income / 12 if co_applicant_income > 0 else 0
+        foir_limit = 0.75 if monthly_income >= 100000 else 0.60
         for vendor, loan_preference in eligible_vendors:
             vendor_name = vendor.get("vendorName")
-            co_applicant_income = co_applicant_details.get("co_applicant_income_amount", {}).get("amount", 0)
-            monthly_income = co_applicant_income / 12 if co_applicant_income > 0 else 0
-            foir_limit = 0.75 if monthly_income >= 100000 else 0.60
-            
             foir, adjusted_loan, foir_message = calculate_foir(
                 student_profile,
                 vendor,
@@ -922,41 +1158,36 @@ def get_function_based_vendor_matches(student_profile: Dict, vendors: Optional[L
                 loan_preference=loan_preference,
                 foir_limit=foir_limit
             )
-            foir_results[(vendor_name, loan_preference)] = {
+            foir_results.append({
                 "foir": foir,
                 "adjusted_loan": adjusted_loan,
                 "message": foir_message
-            }
+            })
             
-            interest_rate = vendor["criteria"].get(
-                "interest_rate_secured" if loan_preference == "Secured" else "interest_rate_unsecured",
-                vendor["criteria"].get("interest_rate_unsecured_upto", "10%")
-            )
-            logger.info(f"{vendor_name}:\n"
-                        f"  - Interest Rate: {interest_rate}\n"
-                        f"  - Adjusted Loan: {format_amount(adjusted_loan)} INR\n"
-                        f"  - FOIR: {foir:.2f}%\n"
-                        f"  - FOIR Suggestion: {foir_message}")
+            if logger.isEnabledFor(logging.INFO):
+                interest_rate = vendor["criteria"].get(
+                    "interest_rate_secured" if loan_preference == "Secured" else "interest_rate_unsecured",
+                    vendor["criteria"].get("interest_rate_unsecured_upto", "10%")
+                )
+                logger.info("%s:\n"
+                            "  - Interest Rate: %s\n"
+                            "  - Adjusted Loan: %s INR\n"
+                            "  - FOIR: %.2f%%\n"
+                            "  - FOIR Suggestion: %s",
+                            vendor_name, interest_rate, format_amount(adjusted_loan), foir, foir_message)
 
         # Calculate scores and rank vendors
         logger.info("### Step 3: Scoring and Ranking")
         scored_vendors = []
         
-        for vendor, loan_preference in eligible_vendors:
+        score_vendor = build_vendor_scorer(student_profile, university_vendors_norm)
+        for (vendor, loan_preference), foir_result in zip(eligible_vendors, foir_results):
             vendor_name = vendor.get("vendorName")
-            score = calculate_vendor_score(
-                vendor, 
-                student_profile, 
-                loan_preference, 
-                university_vendors, 
-                no_university_vendors, 
-                foir_results
-            )
+            score = score_vendor(vendor, loan_preference, foir_result, min_score=MIN_MATCH_SCORE)
             
             # Only include vendors with score >= 50
-            if score >= 50:
+            if score >= MIN_MATCH_SCORE:
                 criteria = vendor.get("criteria", {})
-                foir_result = foir_results.get((vendor_name, loan_preference), {})
                 
                 # Determine match type based on score
                 if score >= 80:
@@ -991,9 +1222,10 @@ def get_function_based_vendor_matches(student_profile: Dict, vendors: Optional[L
                 }
                 
                 scored_vendors.append(vendor_match)
-                logger.info(f"{vendor_name} ({loan_preference}):\n"
-                            f"  - Score: {score}\n"
-                            f"  - Match Type: {match_type}")
+                logger.info("%s (%s):\n"
+                            "  - Score: %s\n"
+                            "  - Match Type: %s",
+                            vendor_name, loan_preference, score, match_type)
 
         # Sort by score (descending)
         scored_vendors.sort(key=lambda x: x["score"], reverse=True)
@@ -1028,121 +1260,47 @@ def generate_function_based_document_list(student_profile: Dict) -> str:
             "co_applicant_relation": loan_details.get("co_applicant_relation", "Unknown")
         }
 
-    # Base document structure
-    document_sections = OrderedDict()
-    
     # Student Documents (always included)
-    student_docs = [
-        "Photograph",
-        "Aadhaar Card", 
-        "PAN Card",
-        "Passport",
-        "Offer Letter",
-        "10th/12th Marksheet and Passing Certificate"
-    ]
+    student_docs = STUDENT_DOCS_BASE
     
     # Add degree documents if applicable
     highest_education = education_details.get("highest_education_level", "")
-    if highest_education and highest_education not in ["High School", "12th Grade"]:
-        student_docs.append("Degree Marksheet and Certificate")
+    if highest_education and highest_education not in ("High School", "12th Grade"):
+        student_docs += (STUDENT_DEGREE_DOC,)
     
     # Add test scorecards if applicable
     english_test = education_details.get("english_test", {})
     standardized_test = education_details.get("standardized_test", {})
     if (english_test.get("type") and english_test.get("type") != "None") or (standardized_test.get("type") and standardized_test.get("type") != "None"):
-        student_docs.append("Scorecard (IELTS, TOEFL, GRE, etc., if applicable)")
+        student_docs += (STUDENT_SCORECARD_DOC,)
     
-    student_docs.extend([
-        "Student Email ID and Phone Number",
-        "Bank Statements (Last 6 Months)"
-    ])
-    
-    document_sections["Student Documents (PDF)"] = student_docs
+    sections = [("Student Documents (PDF)", student_docs + STUDENT_DOCS_TAIL)]
     
     # Co-applicant documents based on occupation
     if loan_details.get("co_applicant_available") == "Yes":
         co_applicant_occupation = co_applicant_details.get("co_applicant_occupation", "Salaried")
-        
-        base_co_applicant_docs = [
-            "Photograph",
-            "PAN Card", 
-            "Aadhaar Card"
-        ]
-        
-        if co_applicant_occupation == "Salaried":
-            co_applicant_docs = base_co_applicant_docs + [
-                "Last 3 Months Salary Slips",
-                "Last 6 Months Bank Statement",
-                "Last 2 Years Form 16",
-                "Utility Bill (e.g., Electricity Bill)",
-                "Rent Agreement (if applicable)",
-                "Co-Applicant Phone Number and Email ID"
-            ]
-            document_sections["Co-Applicant Documents (Salaried, PDF)"] = co_applicant_docs
-            
-        elif co_applicant_occupation == "Self-Employed":
-            co_applicant_docs = base_co_applicant_docs + [
-                "GST 3B Last 1 Year and GST Certificate (Merged PDF)",
-                "ITR of Last 2 Years with Computation Page",
-                "Current Account Statement (Last 6 Months)",
-                "Savings Account Statement (Last 6 Months)",
-                "Audit Report of Last 2 Years",
-                "Utility Bill (e.g., Electricity Bill)",
-                "Co-Applicant Phone Number and Email ID"
-            ]
-            document_sections["Co-Applicant Documents (Self-Employed, PDF)"] = co_applicant_docs
-            
-        elif co_applicant_occupation == "Farmer":
-            co_applicant_docs = base_co_applicant_docs + [
-                "Land Ownership Documents",
-                "Last 6 Months Bank Statement",
-                "Utility Bill (e.g., Electricity Bill)",
-                "Co-Applicant Phone Number and Email ID"
-            ]
-            document_sections["Co-Applicant Documents (Farmer, PDF)"] = co_applicant_docs
-            
-        else:  # Unemployed or Other
-            co_applicant_docs = base_co_applicant_docs + [
-                "Last 6 Months Bank Statement (if applicable)",
-                "Utility Bill (e.g., Electricity Bill)",
-                "Co-Applicant Phone Number and Email ID"
-            ]
-            section_name = f"Co-Applicant Documents ({co_applicant_occupation or 'Other'}, PDF)"
-            document_sections[section_name] = co_applicant_docs
+        co_applicant_docs = CO_APPLICANT_DOCS_BY_OCCUPATION.get(co_applicant_occupation)
+        if co_applicant_docs is None:  # Unemployed or Other
+            co_applicant_docs = CO_APPLICANT_DOCS_OTHER
+            co_applicant_occupation = co_applicant_occupation or "Other"
+        sections.append((f"Co-Applicant Documents ({co_applicant_occupation}, PDF)", co_applicant_docs))
     
     # Collateral documents for secured loans
     if loan_details.get("collateral_available") == "Yes":
         collateral_type = loan_details.get("collateral_type", "")
-        
-        if collateral_type in ["Residential", "Commercial"]:
-            property_docs = [
-                "Complete Registered Agreement",
-                "Index 2",
-                "Title Deed",
-                "Sale Deed",
-                "Sanctioned Plan (Blueprint)",
-                "Non-Agricultural Order"
-            ]
-            document_sections[f"Property Documents ({collateral_type})"] = property_docs
-            document_sections["Property Owners"] = ["PAN Card", "Aadhaar Card"]
-        elif collateral_type == "FD":
-            document_sections["Fixed Deposit Documents"] = [
-                "Fixed Deposit Receipt",
-                "Bank Statement showing FD",
-                "FD Holder's PAN Card",
-                "FD Holder's Aadhaar Card"
-            ]
+        collateral_docs = COLLATERAL_DOCS.get(collateral_type)
+        if collateral_type == "FD":
+            sections.append(("Fixed Deposit Documents", collateral_docs))
+        elif collateral_docs is not None:
+            sections.append((f"Property Documents ({collateral_type})", collateral_docs))
+            sections.append(("Property Owners", PROPERTY_OWNER_DOCS))
     
     # Format as readable text
-    formatted_docs = []
-    for section, docs in document_sections.items():
-        formatted_docs.append(f"{section}:")
-        for i, doc in enumerate(docs, 1):
-            formatted_docs.append(f"{i}. {doc}")
-        formatted_docs.append("")
-    
-    result = "\n".join(formatted_docs).strip()
-    logger.info(f"Generated function-based document list with {len(document_sections)} sections")
+    result = "\n\n".join(
+        f"{title}:\n" + "\n".join(f"{i}. {doc}" for i, doc in enumerate(docs, 1))
+        for title, docs in sections
+    )
+    logger.info(f"Generated function-based document list with {len(sections)} sections")
     
     return result
 
@@ -1164,24 +1322,86 @@ def generate_document_list(student_profile: Dict, use_llm: bool = False) -> str:
     """
     return generate_function_based_document_list(student_profile)
 
-def generate_profile_suggestions(profile_data: Dict) -> List[Dict]:
-    """Generate AI-powered suggestions for improving a student's loan profile."""
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    
-    if not openai_api_key:
-        logger.error("OpenAI API key not found")
-        return []
+# Markdown code fence the model sometimes wraps its JSON in
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\n([\s\S]*?)\n```", re.DOTALL)
 
-    client = OpenAI(api_key=openai_api_key)
-    
-    # Optimized prompt for GPT-3.5-turbo: Simplified, strict JSON instruction
-    prompt_template = """
-You are an expert education loan advisor. Analyze the student's profile and provide 5-7 actionable suggestions to improve loan eligibility, targeting more vendor matches, better rates, higher amounts, and approval chances.
+SUGGESTION_FIELDS = ("title", "description", "priority", "timeframe", "impact")
+SUGGESTION_PRIORITIES = frozenset({"high", "medium", "low"})
 
-# PROFILE
-{{student_profile_json}}
+def is_valid_suggestion(suggestion, check_lengths: bool = True) -> bool:
+    """Check that a single parsed suggestion has the expected fields and limits."""
+    return (
+        isinstance(suggestion, dict) and all(k in suggestion for k in SUGGESTION_FIELDS)
+        and suggestion["priority"] in SUGGESTION_PRIORITIES
+        and (not check_lengths or (len(suggestion["title"].split()) <= 10 and len(suggestion["description"].split()) <= 50))
+    )
+
+def is_valid_suggestion_list(suggestions, check_lengths: bool = True) -> bool:
+    """Check that parsed LLM output is a list of 5-7 well-formed suggestions."""
+    if not isinstance(suggestions, list) or not 5 <= len(suggestions) <= 7:
+        return False
+    return all(is_valid_suggestion(s, check_lengths) for s in suggestions)
+
+# Redis cache for LLM suggestions; identical profiles reuse the last answer for an hour
+SUGGESTION_CACHE_TTL_SECONDS = 3600
+SUGGESTION_CACHE_VOLATILE_FIELDS = frozenset({"created_at", "updated_at", "_id"})
+# Fall back to calling OpenAI if Redis stalls
+SUGGESTION_CACHE_TIMEOUT_SECONDS = 0.5
+suggestion_cache = (
+    redis.Redis.from_url(
+        os.getenv("REDIS_URI"),
+        socket_connect_timeout=SUGGESTION_CACHE_TIMEOUT_SECONDS,
+        socket_timeout=SUGGESTION_CACHE_TIMEOUT_SECONDS,
+    )
+    if os.getenv("REDIS_URI")
+    else None
+)
+
+def normalize_profile_for_cache(value):
+    """Drop volatile fields and lowercase strings so equivalent profiles hash alike."""
+    if isinstance(value, dict):
+        return {k: normalize_profile_for_cache(v) for k, v in value.items() if k not in SUGGESTION_CACHE_VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [normalize_profile_for_cache(v) for v in value]
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+def suggestion_cache_key(profile_data: Dict) -> str:
+    """Build a stable Redis key from the normalized profile."""
+    payload = orjson.dumps(normalize_profile_for_cache(profile_data), default=str, option=orjson.OPT_SORT_KEYS)
+    return "sugg:" + hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def generate_profile_suggestions(profile_data: Dict) -> List[Dict]:
+    """Generate suggestions for a profile, serving repeats from the Redis cache."""
+    if suggestion_cache is None:
+        return request_profile_suggestions(profile_data)
+
+    key = suggestion_cache_key(profile_data)
+    try:
+        cached = suggestion_cache.get(key)
+        if cached:
+            return orjson.loads(cached)
+    except (redis.RedisError, orjson.JSONDecodeError) as e:
+        logger.warning("Suggestion cache lookup failed: %s", str(e))
+
+    suggestions = request_profile_suggestions(profile_data)
+    if suggestions:
+        try:
+            suggestion_cache.setex(key, SUGGESTION_CACHE_TTL_SECONDS, orjson.dumps(suggestions))
+        except redis.RedisError as e:
+            logger.warning("Failed to cache suggestions: %s", str(e))
+    return suggestions
+
+# System message for the retry after an unparseable or malformed answer
+STRICT_SUGGESTION_SYSTEM_MESSAGE = (
+    "You are an expert education loan advisor. Return ONLY a JSON array of 5-7 objects, "
+    "no prose, no markdown."
+)
 
-# CRITERIA
+# Optimized prompt for GPT-3.5-turbo: Simplified, strict JSON instruction
+# Prompt sections shared by the single-profile and batch suggestion prompts
+_SUGGESTION_CRITERIA = """# CRITERIA
 - Academic: marks_10th.value, marks_12th.value (min 60%)
 - Tests: IELTS (min 6), TOEFL (min 80), PTE (min 51)
 - Study: study_destination_country, university_name
@@ -1189,38 +1409,66 @@ You are an expert education loan advisor. Analyze the student's profile and prov
 - CIBIL: cibil_score (min 700 for higher limits)
 - Course: intended_degree (Master's preferred), course_type
 - FOIR: 75% (income ≥ ₹100,000/month) or 50%; Master's with PSI uses ₹5,000 EMI during moratorium if CIBIL ≥ 700
-
-# FORMAT
-Return a JSON array of 5-7 objects:
-{
+"""
+_SUGGESTION_OBJECT_FORMAT = """{
   "title": "<≤10 words>",
   "description": "<2-3 sentences, ≤50 words>",
   "priority": "high|medium|low",
   "timeframe": "<e.g., 1-2 weeks>",
   "impact": "<specific benefit, e.g., Increases eligibility by 20%>"
 }
-Sort by priority (high first). Output MUST be valid JSON, no extra text or markdown.
-
-# GUIDELINES
-- Verify fields (e.g., study_destination_country, course_type) to avoid irrelevant suggestions.
+"""
+_SUGGESTION_GUIDELINES = """- Verify fields (e.g., study_destination_country, course_type) to avoid irrelevant suggestions.
 - Prioritize low income, no collateral, low scores.
 - Suggest collateral, higher IELTS (<7), stronger co-applicant.
 - For Master's with PSI and CIBIL ≥ 700, highlight full loan potential.
 - Respond with plain JSON only. No markdown, no ```json tags.
 - Ensure realistic, high-impact fixes.
-    """
+"""
+
+SUGGESTION_PROMPT_TEMPLATE = """
+You are an expert education loan advisor. Analyze the student's profile and provide 5-7 actionable suggestions to improve loan eligibility, targeting more vendor matches, better rates, higher amounts, and approval chances.
+
+# PROFILE
+{{student_profile_json}}
+
+""" + _SUGGESTION_CRITERIA + """
+# FORMAT
+Return a JSON array of 5-7 objects:
+""" + _SUGGESTION_OBJECT_FORMAT + """Sort by priority (high first). Output MUST be valid JSON, no extra text or markdown.
+
+# GUIDELINES
+""" + _SUGGESTION_GUIDELINES + "    "
+# Split once around the placeholder so each prompt is a plain concatenation
+_SUGGESTION_PROMPT_PREFIX, _SUGGESTION_PROMPT_SUFFIX = SUGGESTION_PROMPT_TEMPLATE.split("{{student_profile_json}}", 1)
+
+SUGGESTION_SYSTEM_MESSAGE = "You are an expert education loan advisor. Return valid JSON only."
+
+def build_suggestion_prompt(profile_data: Dict) -> str:
+    """Build the single-profile suggestion prompt."""
+    return _SUGGESTION_PROMPT_PREFIX + orjson.dumps(profile_data, option=orjson.OPT_INDENT_2).decode() + _SUGGESTION_PROMPT_SUFFIX
+
+def request_profile_suggestions(profile_data: Dict) -> List[Dict]:
+    """Generate AI-powered suggestions for improving a student's loan profile."""
+    openai_api_key = os.getenv("OPENAI_API_KEY")
     
-    # Replace placeholder with profile data
-    prompt = prompt_template.replace("{{student_profile_json}}", json.dumps(profile_data, indent=2))
+    if not openai_api_key:
+        logger.error("OpenAI API key not found")
+        return []
+
+    client = OpenAI(api_key=openai_api_key)
+    
+    prompt = build_suggestion_prompt(profile_data)
     
     # Retry logic for robust parsing
     max_retries = 2
+    system_message = SUGGESTION_SYSTEM_MESSAGE
     for attempt in range(max_retries):
         try:
             response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "You are an expert education loan advisor. Return valid JSON only."},
+                    {"role": "system", "content": system_message},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.2,
@@ -1232,46 +1480,175 @@ Sort by priority (high first). Output MUST be valid JSON, no extra text or markd
             
             # Parse JSON response
             try:
-                suggestions = json.loads(content)
-                if isinstance(suggestions, list) and 5 <= len(suggestions) <= 7:
-                    # Validate suggestion structure
-                    valid = all(
-                        isinstance(s, dict) and all(k in s for k in ["title", "description", "priority", "timeframe", "impact"])
-                        and s["priority"] in ["high", "medium", "low"]
-                        and len(s["title"].split()) <= 10
-                        and len(s["description"].split()) <= 50
-                        for s in suggestions
-                    )
-                    if valid:
-                        return suggestions
-            except json.JSONDecodeError:
-                # Try extracting from markdown
-                json_match = re.search(r"```(?:json)?\n([\s\S]*?)\n```", content, re.DOTALL)
+                suggestions = orjson.loads(content)
+                # Validate suggestion structure
+                if is_valid_suggestion_list(suggestions):
+                    return suggestions
+            except orjson.JSONDecodeError:
+                # Try extracting from markdown; bare JSON that failed to parse has no fence to find
+                json_match = None if content.startswith(("{", "[")) else _JSON_FENCE_RE.search(content)
                 if json_match:
                     try:
-                        suggestions = json.loads(json_match.group(1))
-                        if isinstance(suggestions, list) and 5 <= len(suggestions) <= 7:
-                            valid = all(
-                                isinstance(s, dict) and all(k in s for k in ["title", "description", "priority", "timeframe", "impact"])
-                                and s["priority"] in ["high", "medium", "low"]
-                                for s in suggestions
-                            )
-                            if valid:
-                                return suggestions
-                    except json.JSONDecodeError:
+                        suggestions = orjson.loads(json_match.group(1))
+                        if is_valid_suggestion_list(suggestions, check_lengths=False):
+                            return suggestions
+                    except orjson.JSONDecodeError:
                         pass
             
+            # Waiting will not fix a malformed answer; retry at once with a stricter instruction
             logger.warning("Failed to parse OpenAI response on attempt %d", attempt + 1)
+            system_message = STRICT_SUGGESTION_SYSTEM_MESSAGE
+        except (APIConnectionError, RateLimitError, InternalServerError) as e:
+            logger.error("Transient OpenAI API error on attempt %d: %s", attempt + 1, str(e))
             if attempt < max_retries - 1:
-                time.sleep(1)  # Brief delay before retry
-                continue
-            return []
+                time.sleep(0.25 * 2 ** attempt)
         except Exception as e:
             logger.error("Error calling OpenAI API on attempt %d: %s", attempt + 1, str(e))
-            if attempt < max_retries - 1:
-                time.sleep(1)
-                continue
-            return []
     
     logger.error("Failed to generate valid suggestions after %d attempts", max_retries)
-    return []
\ No newline at end of file
+    return []
+
+def iter_streamed_json_objects(chunks: Iterable[str]) -> Iterator[Dict]:
+    """Yield each top-level object of a streamed JSON array as soon as its closing brace arrives."""
+    depth = 0
+    in_string = False
+    escaped = False
+    buffer = []
+    for chunk in chunks:
+        for ch in chunk:
+            if depth == 0:
+                # Skip the array brackets, commas and any stray text between objects
+                if ch == "{":
+                    depth = 1
+                    buffer = [ch]
+                continue
+            buffer.append(ch)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        yield orjson.loads("".join(buffer))
+                    except orjson.JSONDecodeError:
+                        logger.warning("Skipping malformed streamed suggestion object")
+
+def stream_profile_suggestions(profile_data: Dict) -> Iterator[Dict]:
+    """Yield suggestions one by one while the OpenAI response is still streaming."""
+    key = suggestion_cache_key(profile_data) if suggestion_cache is not None else None
+    if key is not None:
+        try:
+            cached = suggestion_cache.get(key)
+            if cached:
+                yield from orjson.loads(cached)
+                return
+        except (redis.RedisError, orjson.JSONDecodeError) as e:
+            logger.warning("Suggestion cache lookup failed: %s", str(e))
+
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        logger.error("OpenAI API key not found")
+        return
+
+    client = OpenAI(api_key=openai_api_key)
+    try:
+        response = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": SUGGESTION_SYSTEM_MESSAGE},
+                {"role": "user", "content": build_suggestion_prompt(profile_data)}
+            ],
+            temperature=0.2,
+            stream=True,
+        )
+        deltas = (chunk.choices[0].delta.content or "" for chunk in response if chunk.choices)
+        suggestions = []
+        for suggestion in iter_streamed_json_objects(deltas):
+            if is_valid_suggestion(suggestion):
+                suggestions.append(suggestion)
+                yield suggestion
+    except Exception as e:
+        logger.error("Error streaming suggestions from OpenAI API: %s", str(e))
+        return
+
+    if key is not None and is_valid_suggestion_list(suggestions):
+        try:
+            suggestion_cache.setex(key, SUGGESTION_CACHE_TTL_SECONDS, orjson.dumps(suggestions))
+        except redis.RedisError as e:
+            logger.warning("Failed to cache suggestions: %s", str(e))
+
+# Batch prompt reuses the single-profile sections so the two cannot drift apart
+BATCH_SUGGESTION_PROMPT_TEMPLATE = """
+You are an expert education loan advisor. For EACH student profile below, provide 5-7 actionable suggestions to improve loan eligibility, targeting more vendor matches, better rates, higher amounts, and approval chances.
+
+# PROFILES
+A JSON array of {"id": "<id>", "profile": {...}} objects:
+{{profiles_json}}
+
+""" + _SUGGESTION_CRITERIA + """
+# FORMAT
+Return a JSON object mapping every profile "id" to an array of 5-7 objects:
+""" + _SUGGESTION_OBJECT_FORMAT + """Sort each array by priority (high first). Output MUST be valid JSON, no extra text or markdown.
+
+# GUIDELINES
+- Judge each profile on its own fields; never mix details between profiles.
+""" + _SUGGESTION_GUIDELINES
+
+_BATCH_PROMPT_PREFIX, _BATCH_PROMPT_SUFFIX = BATCH_SUGGESTION_PROMPT_TEMPLATE.split("{{profiles_json}}", 1)
+# Upper bound on profiles per batch call so the combined answer fits the model's output limit
+SUGGESTION_BATCH_MAX_PROFILES = 5
+
+def generate_suggestions_batch(profiles: List[Dict]) -> List[List[Dict]]:
+    """Generate suggestions for several profiles with one OpenAI call, aligned with the input order."""
+    if not profiles:
+        return []
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        logger.error("OpenAI API key not found")
+        return [[] for _ in profiles]
+
+    client = OpenAI(api_key=openai_api_key)
+    batch = [{"id": str(i), "profile": profile} for i, profile in enumerate(profiles)]
+    prompt = _BATCH_PROMPT_PREFIX + orjson.dumps(batch, option=orjson.OPT_INDENT_2).decode() + _BATCH_PROMPT_SUFFIX
+
+    by_id = {}
+    try:
+        response = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": SUGGESTION_SYSTEM_MESSAGE},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.2,
+        )
+        content = response.choices[0].message.content.strip()
+        logger.debug("OpenAI batch response: %s", content[:500])
+        parsed = orjson.loads(content)
+        if isinstance(parsed, dict):
+            by_id = parsed
+        else:
+            logger.warning("OpenAI batch response is not a JSON object")
+    except orjson.JSONDecodeError:
+        logger.warning("Failed to parse OpenAI batch response")
+    except Exception as e:
+        logger.error("Error calling OpenAI API for suggestion batch: %s", str(e))
+
+    # Only profiles whose entry is missing or malformed pay for an individual call
+    results = []
+    for item in batch:
+        suggestions = by_id.get(item["id"])
+        if is_valid_suggestion_list(suggestions):
+            results.append(suggestions)
+        else:
+            logger.info("Falling back to single-profile suggestions for batch entry %s", item["id"])
+            results.append(generate_profile_suggestions(item["profile"]))
+    return results
@@ -1,10 +1,16 @@
 # backend/app/services/pincode_service.py
 # Pincode lookup service for city and state
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import Optional, Dict
+import orjson
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 from pymongo import MongoClient
+import redis
 import os
 
 logger = logging.getLogger(__name__)
@@ -13,20 +19,125 @@ logger = logging.getLogger(__name__)
 client = MongoClient(os.getenv("MONGO_URI"))
 db = client["FA_bots"]
 
+# Redis cache in front of MongoDB; pincodes are effectively static, so entries live long
+PINCODE_CACHE_TTL_SECONDS = 30 * 86400
+# Per-process memo of resolved pincodes, checked before Redis
+PINCODE_LRU_MAXSIZE = 4096
+# Fail fast to the MongoDB path if Redis stalls
+REDIS_TIMEOUT_SECONDS = 0.5
+redis_client = (
+    redis.Redis.from_url(
+        os.getenv("REDIS_URI"),
+        socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_TIMEOUT_SECONDS,
+    )
+    if os.getenv("REDIS_URI")
+    else None
+)
+
+
+# Pooled HTTP session so calls to the postal API reuse TCP/TLS connections
+http_session = requests.Session()
+http_session.headers.update({"User-Agent": "LoanAssistanceTool/1.0"})
+http_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+
+def _pincode_cache_key(pincode: str) -> str:
+    return f"pincode:{pincode}"
+
+
+def get_cached_location(pincode: str) -> Optional[Dict]:
+    """Return the cached location for a pincode, or None on a miss or Redis failure."""
+    if redis_client is None:
+        return None
+    try:
+        cached = redis_client.get(_pincode_cache_key(pincode))
+    except redis.RedisError as e:
+        logger.warning(f"Redis lookup failed for pincode {pincode}: {e}")
+        return None
+    if not cached:
+        return None
+    try:
+        return orjson.loads(cached)
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"Ignoring corrupt cached location for pincode {pincode}: {e}")
+        return None
+
+
+def cache_location(pincode: str, location: Dict) -> None:
+    """Store a resolved location in Redis, ignoring Redis failures."""
+    if redis_client is None:
+        return
+    try:
+        redis_client.setex(_pincode_cache_key(pincode), PINCODE_CACHE_TTL_SECONDS, orjson.dumps(location))
+    except redis.RedisError as e:
+        logger.warning(f"Failed to cache pincode {pincode} in Redis: {e}")
+
+
+class _PincodeNotResolved(Exception):
+    """Raised inside the memoized resolver so failed lookups are not cached."""
+
+
+@lru_cache(maxsize=PINCODE_LRU_MAXSIZE)
+def _get_location_memoized(pincode: str) -> Tuple[str, str]:
+    location = _resolve_pincode_uncached(pincode)
+    if location is None:
+        raise _PincodeNotResolved(pincode)
+    return location["city"], location["state"]
+
 
 def get_location_from_pincode(pincode: str) -> Optional[Dict]:
-    """Fetch city and state from pincode using MongoDB or external API."""
-    # Check MongoDB first
+    """Fetch city and state from pincode, memoized per process."""
+    try:
+        city, state = _get_location_memoized(pincode)
+    except _PincodeNotResolved:
+        return None
+    return {"city": city, "state": state}
+
+
+async def get_location_from_pincode_async(pincode: str) -> Optional[Dict]:
+    """Resolve a pincode in a worker thread so the event loop is not blocked."""
+    return await asyncio.to_thread(get_location_from_pincode, pincode)
+
+
+async def batch_get_locations(pincodes: List[str]) -> Dict[str, Optional[Dict]]:
+    """Resolve several pincodes concurrently, keyed by pincode."""
+    unique_pincodes = list(dict.fromkeys(pincodes))
+    locations = await asyncio.gather(*(get_location_from_pincode_async(p) for p in unique_pincodes))
+    return dict(zip(unique_pincodes, locations))
+
+
+def clear_pincode_cache() -> None:
+    """Drop the in-process pincode memo, e.g. after correcting pincode data."""
+    _get_location_memoized.cache_clear()
+
+
+def _resolve_pincode_uncached(pincode: str) -> Optional[Dict]:
+    """Fetch city and state from pincode using Redis, MongoDB or external API."""
+    # Check Redis first
+    location = get_cached_location(pincode)
+    if location:
+        return location
+
+    # Then MongoDB
     pincode_doc = db.pincode.find_one({"pincode": pincode})
     if pincode_doc:
-        return {"city": pincode_doc["city"], "state": pincode_doc["state"]}
+        location = {"city": pincode_doc["city"], "state": pincode_doc["state"]}
+        cache_location(pincode, location)
+        return location
 
     # Fallback to external API (e.g., postalpincode.in)
     try:
-        response = requests.get(
+        response = http_session.get(
             f"https://api.postalpincode.in/pincode/{pincode}",
             timeout=10,  # Add timeout
-            headers={"User-Agent": "LoanAssistanceTool/1.0"},  # Add user agent
         )
         response.raise_for_status()
         data = response.json()
@@ -51,6 +162,7 @@ def get_location_from_pincode(pincode: str) -> Optional[Dict]:
                         )
                     except Exception as db_error:
                         logger.warning(f"Failed to cache pincode data: {db_error}")
+                    cache_location(pincode, location)
                 return location
 
         logger.warning(f"No valid data found for pincode: {pincode}")
@@ -3,8 +3,10 @@
 
 import boto3
 from botocore.exceptions import ClientError
+from cachetools import TLRUCache
 import os
 import logging
+import time
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -34,11 +36,33 @@ BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
 if not BUCKET_NAME:
     logger.warning("S3_BUCKET_NAME not configured. Document upload will not work.")
 
+# Warm the service model and signer at import so the first real request does not pay for it;
+# presigning is local and makes no network call
+if s3_client and BUCKET_NAME:
+    try:
+        s3_client.generate_presigned_url(
+            "put_object", Params={"Bucket": BUCKET_NAME, "Key": "_warmup"}, ExpiresIn=60
+        )
+    except Exception as e:
+        logger.warning(f"S3 signer warm-up failed: {e}")
+
+# Signed URLs are reused for 80% of their lifetime so repeat requests skip SigV4 signing.
+# Entries store their own reuse deadline, which the cache uses as the per-entry expiry.
+PRESIGNED_URL_REUSE_FRACTION = 0.8
+_presigned_url_cache = TLRUCache(
+    maxsize=2048, ttu=lambda _key, value, _now: value[1], timer=time.time
+)
+
 
 def generate_presigned_url(
     student_id: str, document_type: str, file_name: str, expiration: int = 900
 ) -> Optional[str]:
-    """Generate a pre-signed URL for uploading a document to S3."""
+    """Generate a pre-signed URL for uploading a document to S3, reusing a recent one if still fresh."""
+    cache_key = (student_id, document_type, file_name, expiration)
+    cached = _presigned_url_cache.get(cache_key)
+    if cached is not None:
+        return cached[0]
+
     if not s3_client:
         logger.error("S3 client not initialized - missing AWS credentials")
         return None
@@ -61,6 +85,7 @@ def generate_presigned_url(
             ExpiresIn=expiration,
         )
         logger.info(f"Generated pre-signed URL for key: {safe_key}")
+        _presigned_url_cache[cache_key] = (url, time.time() + expiration * PRESIGNED_URL_REUSE_FRACTION)
         return url
     except ClientError as e:
         logger.error(f"Error generating pre-signed URL: {e}")
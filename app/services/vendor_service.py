@@ -1,6 +1,8 @@
 import logging
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 import json
+from ..utils.vendors_list import VENDORS
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,19 @@ def parse_percentage(value: str) -> float:
     return 0.75
 
 
+def is_parseable_percentage(value) -> bool:
+    """Check whether parse_percentage can read value without falling back to its default."""
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            float(value.strip("%"))
+            return True
+        except ValueError:
+            return False
+    return False
+
+
 def calculate_foir(
     co_applicant_income: float, existing_emi: float, foir_limit: str
 ) -> float:
@@ -30,8 +45,49 @@ def calculate_foir(
         return float("inf")
 
 
-def match_vendors(student_profile: Dict, vendors: List[Dict]) -> Tuple[List[Dict], str]:
-    """Match student profile with vendor criteria."""
+def build_vendor_index(vendors: List[Dict]) -> Dict[str, List]:
+    """Pre-compute the vendor criteria used by match_vendors as parallel lists."""
+    index = {
+        "vendors": [],
+        "active": [],
+        "min_academic": [],
+        "max_backlogs": [],
+        "foir_limit": [],
+        "criteria": [],
+    }
+    for vendor in vendors:
+        criteria = vendor.get("criteria", {})
+        index["vendors"].append(vendor)
+        index["active"].append(vendor.get("active", True))
+        index["min_academic"].append(criteria.get("min_academic_score_percentage", 0))
+        index["max_backlogs"].append(
+            criteria.get("max_educational_backlogs", float("inf"))
+        )
+        # FOIR limit in percent, parsed once instead of per student
+        raw_foir = criteria.get("Foir", criteria.get("foir", "75%"))
+        if not is_parseable_percentage(raw_foir):
+            logger.warning(
+                f"Unparseable FOIR {raw_foir!r} for vendor {vendor.get('vendorName')}, using 75%"
+            )
+        index["foir_limit"].append(parse_percentage(raw_foir) * 100)
+        index["criteria"].append(criteria)
+    return index
+
+
+@lru_cache(maxsize=None)
+def get_vendor_index() -> Dict[str, List]:
+    """Return the index for the built-in VENDORS list, building it on first use."""
+    return build_vendor_index(VENDORS)
+
+
+def match_vendors(
+    student_profile: Dict, vendors: List[Dict], vendor_index: Optional[Dict] = None
+) -> Tuple[List[Dict], str]:
+    """Match student profile with vendor criteria.
+
+    The cached get_vendor_index() is used for VENDORS; pass a vendor_index from build_vendor_index
+    to reuse parsed criteria for any other vendor list.
+    """
     try:
         logger.info(
             f"Starting vendor matching for student {student_profile.get('student_id')}"
@@ -44,54 +100,65 @@ def match_vendors(student_profile: Dict, vendors: List[Dict]) -> Tuple[List[Dict
         if not universities:
             return [], "No university specified in profile"
 
-        # Find vendors supporting the universities
-        university_vendors = []
-        for university in universities:
-            supported_vendors = [
-                v["vendorName"] for v in vendors if v.get("active", True)
-            ]
-            logger.info(
-                f"Found vendors for university {university}: {supported_vendors}"
-            )
-            university_vendors.extend(supported_vendors)
-
-        if not university_vendors:
+        # No vendor restricts by university yet, so every active vendor supports them
+        active_vendor_count = sum(1 for v in vendors if v.get("active", True))
+        if not active_vendor_count:
             return [], "No vendors found supporting the specified universities"
-
-        # Filter to unique vendors
-        university_vendors = list(set(university_vendors))
         logger.info(
-            f"Filtered to {len(university_vendors)} university-specific vendors"
+            f"Found {active_vendor_count} active vendors for universities {universities}"
         )
 
+        # Profile-side values are the same for every vendor
+        education = student_profile.get("education_details", {})
+        marks_10th = education.get("marks_10th", {}).get("value", 0)
+        marks_12th = education.get("marks_12th", {}).get("value", 0)
+        backlogs = education.get("educational_backlogs", 0)
+        english_test = education.get("english_test", {})
+        min_test_key = f"min_{english_test.get('type').lower()}_score" if english_test else None
+        test_score = english_test.get("score", 0) if english_test else 0
+
+        co_applicant_details = student_profile.get("co_applicant_details", {})
+        co_applicant_income = co_applicant_details.get(
+            "co_applicant_income_amount", {}
+        ).get("amount", 0)
+        existing_emi = co_applicant_details.get(
+            "co_applicant_existing_loan_emi_amount", {}
+        ).get("amount", 0)
+        current_foir = calculate_foir(co_applicant_income, existing_emi, None)
+
         # Match vendor criteria
+        if vendor_index is not None:
+            index = vendor_index
+        elif vendors is VENDORS:
+            index = get_vendor_index()
+        else:
+            index = build_vendor_index(vendors)
         valid_vendors = []
-        for vendor in vendors:
-            if (
-                not vendor.get("active", True)
-                or vendor["vendorName"] not in university_vendors
-            ):
+        for vendor, active, min_academic, max_backlogs, foir_limit, criteria in zip(
+            index["vendors"],
+            index["active"],
+            index["min_academic"],
+            index["max_backlogs"],
+            index["foir_limit"],
+            index["criteria"],
+        ):
+            if not active:
                 continue
 
-            criteria = vendor.get("criteria", {})
-
-            # Basic eligibility checks
-            if not meets_basic_criteria(student_profile, criteria):
+            if not meets_basic_criteria(
+                marks_10th=marks_10th,
+                marks_12th=marks_12th,
+                backlogs=backlogs,
+                min_test_key=min_test_key,
+                test_score=test_score,
+                min_academic=min_academic,
+                max_backlogs=max_backlogs,
+                criteria=criteria,
+            ):
                 continue
 
-            # FOIR calculation
-            co_applicant_details = student_profile.get("co_applicant_details", {})
-            co_applicant_income = co_applicant_details.get(
-                "co_applicant_income_amount", {}
-            ).get("amount", 0)
-            existing_emi = co_applicant_details.get(
-                "co_applicant_existing_loan_emi_amount", {}
-            ).get("amount", 0)
-
-            foir_limit = criteria.get("Foir", criteria.get("foir", "75%"))
-            current_foir = calculate_foir(co_applicant_income, existing_emi, foir_limit)
-
-            if current_foir > parse_percentage(foir_limit) * 100:
+            # FOIR check
+            if current_foir > foir_limit:
                 continue
 
             valid_vendors.append(vendor)
@@ -108,30 +175,29 @@ def match_vendors(student_profile: Dict, vendors: List[Dict]) -> Tuple[List[Dict
         return [], f"Failed to match vendors: {str(e)}"
 
 
-def meets_basic_criteria(profile: Dict, criteria: Dict) -> bool:
-    """Check if profile meets basic vendor criteria."""
-    education = profile.get("education_details", {})
-
+def meets_basic_criteria(
+    *,
+    marks_10th: float,
+    marks_12th: float,
+    backlogs: int,
+    min_test_key: Optional[str],
+    test_score: float,
+    min_academic: float,
+    max_backlogs: float,
+    criteria: Dict,
+) -> bool:
+    """Check precomputed profile values against one vendor's basic criteria."""
     # Check academic scores
-    min_score = criteria.get("min_academic_score_percentage", 0)
-    marks_10th = education.get("marks_10th", {}).get("value", 0)
-    marks_12th = education.get("marks_12th", {}).get("value", 0)
-    if marks_10th < min_score or marks_12th < min_score:
+    if marks_10th < min_academic or marks_12th < min_academic:
         return False
 
     # Check backlogs
-    max_backlogs = criteria.get("max_educational_backlogs", float("inf"))
-    if education.get("educational_backlogs", 0) > max_backlogs:
+    if backlogs > max_backlogs:
         return False
 
     # Check test scores
-    english_test = education.get("english_test", {})
-    if english_test:
-        test_type = english_test.get("type")
-        score = english_test.get("score", 0)
-        min_score_key = f"min_{test_type.lower()}_score"
-        if criteria.get(min_score_key) and score < criteria[min_score_key]:
-            return False
+    if min_test_key and criteria.get(min_test_key) and test_score < criteria[min_test_key]:
+        return False
 
     return True
 
@@ -2,59 +2,161 @@
 # Authentication utilities for JWT token handling and OTP
 
 import os
+import hashlib
 import logging
 import secrets
+import time
+import threading
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional, Tuple
+from cachetools import TTLCache
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import pymongo
+from pymongo import IndexModel, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 from app.models.user import TokenData, UserResponse
-from app.services.email_service import send_verification_email, generate_otp, send_otp_email
+from app.services.email_service import send_verification_email, generate_otp, send_otp_email, send_email_in_background
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
+# Encoded once so signing and verification skip the str -> bytes conversion
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))  # 24 hours
 OTP_EXPIRE_MINUTES = int(os.getenv("OTP_EXPIRE_MINUTES", "10"))  # 10 minutes
+VERIFICATION_TOKEN_EXPIRE_HOURS = int(os.getenv("VERIFICATION_TOKEN_EXPIRE_HOURS", "24"))  # 24 hours
 
-# Password hashing (kept for backward compatibility)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# User fields needed by the auth flows; other profile data and the password hash are not fetched
+USER_PROJECTION = {
+    "email": 1,
+    "full_name": 1,
+    "mobile_number": 1,
+    "is_active": 1,
+    "is_verified": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "verification_token": 1,
+}
+# Only password verification reads the stored hash
+PASSWORD_AUTH_PROJECTION = {"email": 1, "password": 1, "is_active": 1}
+
+# Password hashing: new hashes use Argon2id; legacy bcrypt hashes still verify
+# and are upgraded on the next successful login. The OTP flow never hashes
+# passwords, so passlib is only imported when a password helper is first used.
+@lru_cache(maxsize=None)
+def _get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=["argon2", "bcrypt"],
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__time_cost=2,
+        argon2__memory_cost=19456,
+        argon2__parallelism=1,
+    )
 
 # HTTP Bearer for token extraction
 security = HTTPBearer()
 
+# Verified token identities keyed by token digest, so repeat requests skip JWT decoding.
+# Only the email claim is cached; the user record is always read fresh so status changes apply at once.
+TOKEN_CACHE_TTL_SECONDS = 60
+_token_email_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+# Shared MongoDB handle; MongoClient pools connections and is safe to share across threads
+_client = None
+_db = None
+_db_lock = threading.Lock()
+
 def get_database_connection():
-    """Get database connection with error handling."""
-    try:
-        client = pymongo.MongoClient(os.getenv("MONGO_URI"))
-        db = client["FA_bots"]
-        return db
-    except Exception as e:
-        logger.error(f"Failed to connect to MongoDB in auth module: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database connection failed"
-        )
+    """Get the shared database handle, connecting on first use."""
+    global _client, _db
+    if _db is not None:
+        return _db
+    with _db_lock:
+        if _db is None:
+            try:
+                client = pymongo.MongoClient(os.getenv("MONGO_URI"), maxPoolSize=50, minPoolSize=5)
+                db = client["FA_bots"]
+            except Exception as e:
+                logger.error(f"Failed to connect to MongoDB in auth module: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Database connection failed"
+                )
+            _client, _db = client, db
+    return _db
+
+def close_database_connection() -> None:
+    """Close the shared MongoDB client; called on application shutdown."""
+    global _client, _db
+    with _db_lock:
+        if _client is not None:
+            _client.close()
+        _client, _db = None, None
+
+# Collections whose indexes enforce correctness rather than speed; failing to build them is fatal
+REQUIRED_INDEX_COLLECTIONS = frozenset({"users", "otps"})
+
+def setup_db_indexes(db) -> None:
+    """Create the indexes behind the auth, OTP and pincode lookups; run once at app startup.
+
+    Each collection gets a single createIndexes command; indexes that already exist are left as is.
+    Raises PyMongoError if an index in REQUIRED_INDEX_COLLECTIONS cannot be built.
+    """
+    indexes = {
+        "users": [
+            IndexModel([("email", pymongo.ASCENDING)], unique=True),
+            IndexModel([("verification_token", pymongo.ASCENDING), ("is_verified", pymongo.ASCENDING)]),
+        ],
+        "pincode": [IndexModel([("pincode", pymongo.ASCENDING)], unique=True)],
+        "otps": [
+            # MongoDB removes OTPs once expires_at has passed
+            IndexModel([("expires_at", pymongo.ASCENDING)], expireAfterSeconds=0),
+            IndexModel([
+                ("email", pymongo.ASCENDING),
+                ("purpose", pymongo.ASCENDING),
+                ("is_used", pymongo.ASCENDING),
+                ("expires_at", pymongo.ASCENDING),
+            ]),
+        ],
+    }
+    for collection, models in indexes.items():
+        try:
+            db[collection].create_indexes(models)
+        except PyMongoError as e:
+            if collection in REQUIRED_INDEX_COLLECTIONS:
+                logger.error(f"Failed to create required indexes on {collection}: {e}")
+                raise
+            logger.warning(f"Failed to create indexes on {collection}: {e}")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _get_pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the stored one is outdated."""
+    return _get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return _get_pwd_context().hash(password)
 
 def generate_verification_token() -> str:
     """Generate a secure verification token."""
-    return secrets.token_urlsafe(32)
+    return secrets.token_hex(32)
 
-def generate_and_store_otp(email: str, purpose: str = "login") -> bool:
-    """Generate OTP and store it in database with expiration."""
+def generate_and_store_otp(email: str, purpose: str = "login", wait_for_send: bool = True) -> bool:
+    """Generate OTP and store it in database with expiration.
+
+    With wait_for_send=False the email is queued and True is returned once the OTP is stored;
+    a failed send then removes the OTP so the user can request a new one.
+    """
     try:
         db = get_database_connection()
         otp = generate_otp()
@@ -74,6 +176,14 @@ def generate_and_store_otp(email: str, purpose: str = "login") -> bool:
             upsert=True
         )
         
+        if not wait_for_send:
+            send_email_in_background(
+                send_otp_email, email, otp, purpose,
+                on_failure=lambda: db.otps.delete_one({"email": email, "purpose": purpose, "otp": otp})
+            )
+            logger.info(f"OTP generated and queued for {email} - purpose: {purpose}")
+            return True
+        
         # Send OTP via email
         success = send_otp_email(email, otp, purpose)
         if success:
@@ -92,25 +202,25 @@ def verify_otp(email: str, otp: str, purpose: str = "login") -> bool:
     try:
         db = get_database_connection()
         
-        # Find valid OTP
-        otp_doc = db.otps.find_one({
-            "email": email,
-            "purpose": purpose,
-            "otp": otp,
-            "expires_at": {"$gt": datetime.utcnow()},
-            "is_used": False
-        })
+        # Match a valid OTP and mark it used in one atomic step
+        now = datetime.utcnow()
+        otp_doc = db.otps.find_one_and_update(
+            {
+                "email": email,
+                "purpose": purpose,
+                "otp": otp,
+                "expires_at": {"$gt": now},
+                "is_used": False
+            },
+            {"$set": {"is_used": True, "used_at": now}},
+            projection={"_id": 1},
+            return_document=ReturnDocument.BEFORE
+        )
         
         if not otp_doc:
             logger.warning(f"Invalid or expired OTP for {email}")
             return False
         
-        # Mark OTP as used
-        db.otps.update_one(
-            {"_id": otp_doc["_id"]},
-            {"$set": {"is_used": True, "used_at": datetime.utcnow()}}
-        )
-        
         logger.info(f"OTP verified successfully for {email}")
         return True
     except Exception as e:
@@ -118,7 +228,10 @@ def verify_otp(email: str, otp: str, purpose: str = "login") -> bool:
         return False
 
 def cleanup_expired_otps():
-    """Clean up expired OTPs from database."""
+    """Clean up expired OTPs from database.
+
+    The TTL index on otps.expires_at already removes them; this is a manual fallback.
+    """
     try:
         db = get_database_connection()
         result = db.otps.delete_many({
@@ -137,13 +250,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> TokenData:
     """Verify and decode a JWT token."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             raise HTTPException(
@@ -160,11 +273,11 @@ def verify_token(token: str) -> TokenData:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_user_by_email(email: str) -> Optional[dict]:
-    """Get user from database by email."""
+def get_user_by_email(email: str, projection: Optional[dict] = None) -> Optional[dict]:
+    """Get user from database by email, limited to USER_PROJECTION fields by default."""
     try:
         db = get_database_connection()
-        user = db.users.find_one({"email": email})
+        user = db.users.find_one({"email": email}, projection or USER_PROJECTION)
         return user
     except Exception as e:
         logger.error(f"Error fetching user by email: {e}")
@@ -182,15 +295,17 @@ def create_user_in_db(user_data: dict) -> str:
         # Generate a unique ID for the user (using email as unique identifier)
         user_data["id"] = user_data["email"]
         
-        # Check if user with this email already exists
-        existing_user = db.users.find_one({"email": user_data["email"]})
-        if existing_user:
+        # The unique index on users.email rejects duplicates atomically; startup
+        # aborts if that index cannot be built, so it is always present here
+        try:
+            result = db.users.insert_one(user_data)
+        except DuplicateKeyError:
             logger.warning(f"Attempted to create duplicate user with email: {user_data['email']}")
             raise ValueError("User with this email already exists")
-        
-        result = db.users.insert_one(user_data)
         logger.info(f"Created new user with ID: {result.inserted_id}")
         return str(result.inserted_id)
+    except ValueError:
+        raise
     except Exception as e:
         logger.error(f"Error creating user in database: {e}")
         raise HTTPException(
@@ -198,6 +313,53 @@ def create_user_in_db(user_data: dict) -> str:
             detail="Failed to create user"
         )
 
+def create_users_bulk(users: List[dict]) -> List[str]:
+    """Create many users with one duplicate check and one bulk write; returns the emails created."""
+    if not users:
+        return []
+    try:
+        db = get_database_connection()
+        emails = [u["email"] for u in users]
+        existing = {u["email"] for u in db.users.find({"email": {"$in": emails}}, {"email": 1})}
+        
+        now = datetime.utcnow()
+        operations = []
+        new_emails = []
+        for user_data in users:
+            email = user_data["email"]
+            if email in existing:
+                logger.warning(f"Skipping duplicate user with email: {email}")
+                continue
+            existing.add(email)
+            user_data = {
+                **user_data,
+                "created_at": now,
+                "updated_at": now,
+                "is_active": True,
+                "is_verified": False,
+                "id": email,
+            }
+            operations.append(InsertOne(user_data))
+            new_emails.append(email)
+        
+        if not operations:
+            return []
+        try:
+            db.users.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Users created concurrently elsewhere hit the unique email index; keep the rest
+            failed = {new_emails[err["index"]] for err in e.details.get("writeErrors", [])}
+            logger.warning(f"Bulk user creation skipped {len(failed)} conflicting users")
+            new_emails = [email for email in new_emails if email not in failed]
+        logger.info(f"Created {len(new_emails)} users in bulk")
+        return new_emails
+    except Exception as e:
+        logger.error(f"Error creating users in bulk: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create users"
+        )
+
 def send_verification_email_to_user(email: str, verification_token: str, full_name: Optional[str] = None) -> bool:
     """Send verification email to user."""
     try:
@@ -236,29 +398,29 @@ def verify_email_token(token: str) -> Optional[str]:
     try:
         db = get_database_connection()
         
-        # Find user with this verification token
-        user = db.users.find_one({
-            "verification_token": token,
-            "verification_token_expires": {"$gt": datetime.utcnow()},
-            "is_verified": False
-        })
-        
-        if not user:
-            return None
-        
-        # Update user as verified
-        db.users.update_one(
-            {"_id": user["_id"]},
+        # Consume the token and mark the user verified in one atomic step
+        now = datetime.utcnow()
+        user = db.users.find_one_and_update(
+            {
+                "verification_token": token,
+                "verification_token_expires": {"$gt": now},
+                "is_verified": False
+            },
             {
                 "$set": {
                     "is_verified": True,
                     "verification_token": None,
                     "verification_token_expires": None,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": now
                 }
-            }
+            },
+            projection={"email": 1},
+            return_document=ReturnDocument.BEFORE
         )
         
+        if not user:
+            return None
+        
         logger.info(f"Email verified for user: {user['email']}")
         return user["email"]
     except Exception as e:
@@ -269,7 +431,7 @@ def resend_verification_email(email: str) -> bool:
     """Resend verification email to user."""
     try:
         db = get_database_connection()
-        user = db.users.find_one({"email": email, "is_verified": False})
+        user = db.users.find_one({"email": email, "is_verified": False}, {"full_name": 1})
         
         if not user:
             return False
@@ -290,22 +452,61 @@ def resend_verification_email(email: str) -> bool:
             }
         )
         
-        # Send new verification email
-        return send_verification_email_to_user(
-            email, 
-            new_token, 
-            user.get("full_name")
-        )
+        # Queue the new verification email; the token is already stored
+        send_email_in_background(send_verification_email_to_user, email, new_token, user.get("full_name"))
+        return True
     except Exception as e:
         logger.error(f"Error resending verification email: {e}")
         return False
 
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def resend_verification_emails_bulk(emails: List[str]) -> int:
+    """Refresh verification tokens for many unverified users in one bulk write and queue their emails."""
+    if not emails:
+        return 0
+    try:
+        db = get_database_connection()
+        users = list(db.users.find({"email": {"$in": emails}, "is_verified": False}, {"email": 1, "full_name": 1}))
+        if not users:
+            return 0
+        
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=VERIFICATION_TOKEN_EXPIRE_HOURS)
+        tokens = [generate_verification_token() for _ in users]
+        db.users.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": user["_id"]},
+                    {"$set": {"verification_token": token, "verification_token_expires": expires_at, "updated_at": now}}
+                )
+                for user, token in zip(users, tokens)
+            ],
+            ordered=False
+        )
+        
+        for user, token in zip(users, tokens):
+            send_email_in_background(send_verification_email_to_user, user["email"], token, user.get("full_name"))
+        return len(users)
+    except Exception as e:
+        logger.error(f"Error resending verification emails in bulk: {e}")
+        return 0
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserResponse:
     """Get current authenticated user."""
     token = credentials.credentials
-    token_data = verify_token(token)
+    cache_key = _token_cache_key(token)
+    cached = _token_email_cache.get(cache_key)
+    if cached is not None and cached[1] > time.time():
+        email = cached[0]
+    else:
+        email = verify_token(token).email
+        # Never serve a cached identity past the token's own expiry
+        expires_at = jwt.get_unverified_claims(token).get("exp", 0)
+        _token_email_cache[cache_key] = (email, expires_at)
     
-    user = get_user_by_email(token_data.email)
+    user = get_user_by_email(email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -313,6 +514,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Deactivation takes effect on the next request, even for tokens already issued
+    if not user.get("is_active", True):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User account is disabled",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     return UserResponse(
         id=str(user["_id"]),
         email=user["email"],
@@ -326,20 +535,26 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 
 def authenticate_user(email: str, password: str) -> Optional[dict]:
     """Authenticate user with email and password (legacy)."""
-    user = get_user_by_email(email)
+    user = get_user_by_email(email, PASSWORD_AUTH_PROJECTION)
     if not user:
         return None
-    if not verify_password(password, user["password"]):
+    verified, new_hash = verify_and_update_password(password, user["password"])
+    if not verified:
         return None
+    if new_hash:
+        try:
+            get_database_connection().users.update_one({"_id": user["_id"]}, {"$set": {"password": new_hash}})
+            user["password"] = new_hash
+        except Exception as e:
+            logger.warning(f"Failed to upgrade password hash for {email}: {e}")
     return user
 
 def authenticate_user_with_otp(email: str, otp: str) -> Optional[dict]:
     """Authenticate user with email and OTP."""
-    # First verify the OTP
+    # Only look the user up once the OTP checks out, so failed attempts cost one query
     if not verify_otp(email, otp, "login"):
         return None
     
-    # Get user from database
     user = get_user_by_email(email)
     if not user:
         return None
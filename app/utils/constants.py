@@ -1,7 +1,11 @@
 # backend/app/utils/constants.py
 # Defines constants for question details and currency options
 
+import ast
+import re
 from enum import Enum
+from types import MappingProxyType
+from typing import Callable, Mapping
 
 
 # Enum for currency codes
@@ -12,8 +16,12 @@ class CurrencyCode(str, Enum):
     USD = "USD"
 
 
-# List of currency options
-CURRENCY_OPTIONS = [c.value for c in CurrencyCode]
+# Currency options
+CURRENCY_OPTIONS = tuple(c.value for c in CurrencyCode)
+
+# Shared numeric choice options
+BACKLOG_OPTIONS = tuple(str(i) for i in range(21))
+EDUCATION_GAP_MONTH_OPTIONS = tuple(str(i) for i in range(0, 31))
 
 # Question details with conditions for modals
 QUESTION_DETAILS = {
@@ -73,7 +81,7 @@ QUESTION_DETAILS = {
     "educational_backlogs": {
         "text": "Do you have any backlogs?",
         "type": "choice",
-        "options": [str(i) for i in range(21)],
+        "options": BACKLOG_OPTIONS,
     },
     "education_gap": {
         "text": "Did you have a gap in your education?",
@@ -83,7 +91,7 @@ QUESTION_DETAILS = {
     "education_gap_duration": {
         "text": "How long was your education gap? (in months)",
         "type": "choice",
-        "options": [str(i) for i in range(0, 31)],
+        "options": EDUCATION_GAP_MONTH_OPTIONS,
         "condition": "education_gap == 'Yes'",
         "explanation": "This question is only asked if the student indicates an education gap.",
     },
@@ -99,20 +107,6 @@ QUESTION_DETAILS = {
         "condition": "current_profession in ['Employed', 'Self-Employed']",
         "explanation": "This question is relevant for employed or self-employed individuals.",
     },
-    "collateral_type": {
-        "text": "Do you have any collateral like FD or property?",
-        "type": "choice",
-        "options": ["FD", "Self-Property", "No"],
-        "condition": "current_profession in ['Unemployed', 'Other']",
-        "explanation": "This question is relevant for unemployed or other professions.",
-    },
-    "collateral_existing_loan": {
-        "text": "Is there an existing loan on this collateral?",
-        "type": "boolean",
-        "options": ["Yes", "No"],
-        "condition": "collateral_type in ['FD', 'Self-Property']",
-        "explanation": "This question is asked if collateral is FD or Self-Property.",
-    },
     "collateral_loan_amount": {
         "text": "What's the existing loan amount on your collateral?",
         "type": "amount_currency",
@@ -312,3 +306,53 @@ QUESTION_DETAILS = {
         "explanation": "This question is asked if the student has a co-applicant.",
     },
 }
+
+
+def _freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Deeply read-only so request handlers cannot mutate the shared question table
+QUESTION_DETAILS = _freeze(QUESTION_DETAILS)
+
+# Condition grammar used above: "<field> == '<v>'", "<field> != '<v>'",
+# "<field> in [<vs>]" and "<field> not in [<vs>]"
+_CONDITION_RE = re.compile(r"^(\w+)\s+(==|!=|in|not in)\s+(.+)$")
+
+
+def _compile_condition(condition: str) -> Callable[[Mapping], bool]:
+    """Turn a condition string into a predicate over a mapping of answers."""
+    match = _CONDITION_RE.match(condition)
+    if not match:
+        raise ValueError(f"Unsupported question condition: {condition}")
+    field, operator, literal = match.groups()
+    value = ast.literal_eval(literal)
+    if operator == "==":
+        return lambda answers: answers.get(field) == value
+    if operator == "!=":
+        return lambda answers: answers.get(field) != value
+    values = frozenset(value)
+    if operator == "in":
+        return lambda answers: answers.get(field) in values
+    return lambda answers: answers.get(field) not in values
+
+
+# Predicates for conditional questions, compiled once at import
+QUESTION_CONDITIONS = MappingProxyType(
+    {
+        key: _compile_condition(question["condition"])
+        for key, question in QUESTION_DETAILS.items()
+        if "condition" in question
+    }
+)
+
+
+def is_question_applicable(question_key: str, answers: Mapping) -> bool:
+    """Check whether a question should be asked given the answers so far."""
+    predicate = QUESTION_CONDITIONS.get(question_key)
+    return predicate is None or predicate(answers)
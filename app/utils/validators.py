@@ -2,25 +2,58 @@
 # Validation functions for input data
 
 import re
+from functools import lru_cache
 from typing import Optional
 
+# Patterns are compiled once at import rather than looked up in re's cache per call
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+# Phone should be 7-15 digits, optionally starting with +
+# First digit (after +) should be 1-9, followed by 6-14 more digits
+_PHONE_RE = re.compile(r"^\+?[1-9]\d{6,14}$")
+# Student ID should be alphanumeric with hyphens/underscores, max 50 chars
+_STUDENT_ID_RE = re.compile(r"^[a-zA-Z0-9_-]{1,50}$")
+
+_ALLOWED_DOC_TYPES = frozenset(
+    {
+        "academic_transcript",
+        "degree_certificate",
+        "passport",
+        "visa",
+        "bank_statement",
+        "financial_document",
+        "english_test_score",
+        "standardized_test_score",
+        "recommendation_letter",
+        "sop",
+        "cv_resume",
+        "other",
+    }
+)
+_ALLOWED_EXTENSIONS = frozenset(
+    {".pdf", ".doc", ".docx", ".jpg", ".jpeg", ".png", ".txt"}
+)
+# File names should be alphanumeric with dots, hyphens, underscores and end in
+# an allowed extension (any case); one match checks both
+_FILE_NAME_RE = re.compile(
+    r"[a-zA-Z0-9._-]*\.(?:"
+    + "|".join(re.escape(ext[1:]) for ext in sorted(_ALLOWED_EXTENSIONS))
+    + r")\Z",
+    re.ASCII | re.IGNORECASE,
+)
+
 
 def validate_email(email: Optional[str]) -> bool:
     """Validate email format if provided."""
     if not email:
         return True
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.match(email) is not None
 
 
 def validate_phone(phone: Optional[str]) -> bool:
     """Validate phone number format if provided."""
     if not phone:
         return True
-    # Phone should be 7-15 digits, optionally starting with +
-    # First digit (after +) should be 1-9, followed by 6-14 more digits
-    pattern = r"^\+?[1-9]\d{6,14}$"
-    return bool(re.match(pattern, phone))
+    return _PHONE_RE.match(phone) is not None
 
 
 def validate_score(
@@ -36,78 +69,68 @@ def validate_pincode(pincode: Optional[str]) -> bool:
     """Validate 6-digit pincode if provided."""
     if not pincode:
         return True
-    return bool(re.match(r"^\d{6}$", pincode))
+    return len(pincode) == 6 and pincode.isdecimal()
 
 
 def validate_cibil_score(score: Optional[str]) -> bool:
     """Validate CIBIL score if provided."""
     if not score:
         return True
-    try:
-        value = int(score)
-        return 300 <= value <= 900
-    except ValueError:
+    # Digit-only strings always parse, so malformed input never raises
+    if not score.isdecimal():
         return False
+    return 300 <= int(score) <= 900
 
 
 def validate_pan(pan: Optional[str]) -> bool:
     """Validate PAN number format if provided."""
     if not pan:
         return True
-    pattern = r"^[A-Z]{5}[0-9]{4}[A-Z]{1}$"
-    return bool(re.match(pattern, pan))
+    # Five uppercase letters, four digits, one uppercase letter
+    if len(pan) != 10 or not pan.isascii():
+        return False
+    letters = pan[:5]
+    return (
+        letters.isalpha()
+        and letters.isupper()
+        and pan[5:9].isdigit()
+        and pan[9].isalpha()
+        and pan[9].isupper()
+    )
 
 
 def validate_aadhaar(aadhaar: Optional[str]) -> bool:
     """Validate Aadhaar number format if provided."""
     if not aadhaar:
         return True
-    pattern = r"^\d{12}$"
-    return bool(re.match(pattern, aadhaar))
+    return len(aadhaar) == 12 and aadhaar.isdecimal()
 
 
 def validate_student_id(student_id: Optional[str]) -> bool:
     """Validate student ID format (alphanumeric, max 50 chars)."""
     if not student_id:
         return False
-    # Student ID should be alphanumeric with hyphens/underscores, max 50 chars
-    pattern = r"^[a-zA-Z0-9_-]{1,50}$"
-    return bool(re.match(pattern, student_id))
+    return _STUDENT_ID_RE.match(student_id) is not None
 
 
+# Document types come from a small fixed vocabulary, so repeat inputs are common
+@lru_cache(maxsize=64)
 def validate_document_type(document_type: Optional[str]) -> bool:
     """Validate document type against allowed values."""
     if not document_type:
         return False
-    allowed_types = {
-        "academic_transcript",
-        "degree_certificate",
-        "passport",
-        "visa",
-        "bank_statement",
-        "financial_document",
-        "english_test_score",
-        "standardized_test_score",
-        "recommendation_letter",
-        "sop",
-        "cv_resume",
-        "other",
-    }
-    return document_type.lower() in allowed_types
+    # Stored document types are already lowercase
+    if document_type in _ALLOWED_DOC_TYPES:
+        return True
+    return document_type.lower() in _ALLOWED_DOC_TYPES
 
 
 def validate_file_name(file_name: Optional[str]) -> bool:
     """Validate file name to prevent path traversal and ensure safe names."""
-    if not file_name:
+    # Reject oversized names before any scan of their contents
+    if not file_name or len(file_name) > 255:
         return False
     # File name should not contain path traversal patterns
     if ".." in file_name or "/" in file_name or "\\" in file_name:
         return False
-    # Should be alphanumeric with dots, hyphens, underscores, max 255 chars
-    pattern = r"^[a-zA-Z0-9._-]{1,255}$"
-    if not re.match(pattern, file_name):
-        return False
-    # Must have a valid file extension
-    allowed_extensions = {".pdf", ".doc", ".docx", ".jpg", ".jpeg", ".png", ".txt"}
-    extension = "." + file_name.lower().split(".")[-1] if "." in file_name else ""
-    return extension in allowed_extensions
+    return _FILE_NAME_RE.match(file_name) is not None
@@ -1,14 +1,23 @@
 # backend/main.py
 # Entry point for the FastAPI application
 
+import asyncio
 import logging
-import pymongo
+import time
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
 from app.api.routes import router
+from app.services.llm_service import ensure_university_name_index
+from app.utils.auth import (
+    close_database_connection,
+    get_database_connection,
+    setup_db_indexes,
+)
 import os
 
 # Configure logging
@@ -46,26 +55,26 @@ if missing_optional:
         f"Missing optional environment variables (some features may not work): {missing_optional}"
     )
 
-# Initialize MongoDB client
-try:
-    mongo_client = pymongo.MongoClient(os.getenv("MONGO_URI"))
-    mongo_client.server_info()  # Test connection
-    logger.info("Successfully connected to MongoDB")
-except Exception as e:
-    logger.error(f"Failed to connect to MongoDB: {str(e)}")
-    raise Exception(f"MongoDB connection failed: {str(e)}")
+# Deployment environment, read once after .env is loaded
+ENV = os.getenv("ENVIRONMENT", "")
+IS_PROD = ENV == "production"
+IS_DEV = ENV == "development"
+
+# Initialize MongoDB client; connectivity is verified on startup
+mongo_client = AsyncIOMotorClient(os.getenv("MONGO_URI"))
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Loan Assistance Tool API",
     description="API for an AI-driven student loan assistance tool",
     version="1.0.0",
-    docs_url="/docs" if os.getenv("ENVIRONMENT") == "development" else None,
-    redoc_url="/redoc" if os.getenv("ENVIRONMENT") == "development" else None,
+    docs_url="/docs" if IS_DEV else None,
+    redoc_url="/redoc" if IS_DEV else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Add security middleware
-if os.getenv("ENVIRONMENT") == "production":
+if IS_PROD:
     # Add trusted host middleware for production
     allowed_hosts = (
         os.getenv("ALLOWED_HOSTS", "").split(",")
@@ -75,17 +84,24 @@ if os.getenv("ENVIRONMENT") == "production":
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=allowed_hosts)
 
 
+# Security headers added to every response; HSTS only in production
+_SEC_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+}
+_SEC_HEADERS_PROD = {
+    **_SEC_HEADERS,
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+}
+_RESPONSE_SEC_HEADERS = _SEC_HEADERS_PROD if IS_PROD else _SEC_HEADERS
+
+
 # Add security headers middleware
 @app.middleware("http")
 async def add_security_headers(request, call_next):
     response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    if os.getenv("ENVIRONMENT") == "production":
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
+    response.headers.update(_RESPONSE_SEC_HEADERS)
     return response
 
 
@@ -99,7 +115,7 @@ origins = [
 ]
 
 # Add wildcard origin in development environment
-if os.getenv("ENVIRONMENT") == "development":
+if IS_DEV:
     origins = ["*"]
 
 app.add_middleware(
@@ -118,14 +134,58 @@ app.include_router(router, prefix="/api")
 logger.info("API routes included")
 
 
+@app.on_event("startup")
+async def verify_mongo_connection():
+    """Fail startup if MongoDB is unreachable."""
+    try:
+        await mongo_client.admin.command("ping")  # Test connection
+        logger.info("Successfully connected to MongoDB")
+    except Exception as e:
+        logger.error(f"Failed to connect to MongoDB: {str(e)}")
+        raise Exception(f"MongoDB connection failed: {str(e)}")
+
+
+@app.on_event("startup")
+async def prepare_auth_indexes():
+    """Build the auth and OTP indexes before serving; startup fails if a required one cannot be built."""
+    await asyncio.to_thread(setup_db_indexes, get_database_connection())
+
+
+@app.on_event("startup")
+async def prepare_university_index():
+    """Build the university name index and backfill it outside the request path."""
+    await asyncio.to_thread(ensure_university_name_index)
+
+
+@app.on_event("shutdown")
+def close_mongo_clients():
+    """Release pooled MongoDB connections when the worker stops."""
+    close_database_connection()
+    mongo_client.close()
+
+
+# Seconds a successful MongoDB ping keeps the health check green
+HEALTH_CHECK_CACHE_SECONDS = 5.0
+_last_health_ok = 0.0
+_health_check_lock = asyncio.Lock()
+
+
 # Health check endpoint
 @app.get("/")
 async def root():
     """Return a basic health check message."""
-    logger.info("Health check endpoint accessed")
-    try:
-        mongo_client.server_info()  # Verify MongoDB connection
+    global _last_health_ok
+    logger.debug("Health check endpoint accessed")
+    if time.monotonic() - _last_health_ok < HEALTH_CHECK_CACHE_SECONDS:
         return {"message": "Loan Assistance Tool API is running"}
-    except Exception as e:
-        logger.error(f"MongoDB health check failed: {str(e)}")
-        raise HTTPException(status_code=500, detail="Database connection error")
+    async with _health_check_lock:
+        # Another request may have refreshed the result while we waited
+        if time.monotonic() - _last_health_ok < HEALTH_CHECK_CACHE_SECONDS:
+            return {"message": "Loan Assistance Tool API is running"}
+        try:
+            await mongo_client.admin.command("ping")  # Verify MongoDB connection
+            _last_health_ok = time.monotonic()
+            return {"message": "Loan Assistance Tool API is running"}
+        except Exception as e:
+            logger.error(f"MongoDB health check failed: {str(e)}")
+            raise HTTPException(status_code=500, detail="Database connection error")
@@ -7,6 +7,10 @@ import requests
 import json
 
 BASE_URL = "http://127.0.0.1:8000/api"
+TIMEOUT_SECONDS = 5
+
+# Shared session keeps one connection alive across all requests
+SESSION = requests.Session()
 
 def test_signup():
     """Test user signup"""
@@ -20,7 +24,7 @@ def test_signup():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/auth/signup", json=signup_data)
+        response = SESSION.post(f"{BASE_URL}/auth/signup", json=signup_data, timeout=TIMEOUT_SECONDS)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.json()}")
         return response.status_code == 200
@@ -38,7 +42,7 @@ def test_login():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
+        response = SESSION.post(f"{BASE_URL}/auth/login", json=login_data, timeout=TIMEOUT_SECONDS)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.json()}")
         
@@ -60,7 +64,7 @@ def test_me_endpoint(token):
     }
     
     try:
-        response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
+        response = SESSION.get(f"{BASE_URL}/auth/me", headers=headers, timeout=TIMEOUT_SECONDS)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.json()}")
         return response.status_code == 200
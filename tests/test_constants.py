@@ -0,0 +1,36 @@
+# backend/tests/test_constants.py
+# Unit tests for question constants and condition predicates
+
+import pytest
+from app.utils.constants import QUESTION_DETAILS, QUESTION_CONDITIONS, is_question_applicable
+
+
+def test_every_condition_is_compiled():
+    """Test that each conditional question has a predicate."""
+    conditional = {k for k, q in QUESTION_DETAILS.items() if "condition" in q}
+    assert set(QUESTION_CONDITIONS) == conditional
+
+
+def test_is_question_applicable():
+    """Test condition evaluation against answers."""
+    assert is_question_applicable("name", {}) == True
+    assert is_question_applicable("education_gap_duration", {"education_gap": "Yes"}) == True
+    assert is_question_applicable("education_gap_duration", {"education_gap": "No"}) == False
+    assert is_question_applicable("academic_score", {"highest_education_level": "Masters"}) == True
+    assert is_question_applicable("academic_score", {"highest_education_level": "High School"}) == False
+    assert is_question_applicable("yearly_income", {"current_profession": "Employed"}) == True
+    assert is_question_applicable("yearly_income", {"current_profession": "Student"}) == False
+    assert is_question_applicable("university_name", {"university_admission_status": "Not applied"}) == False
+    assert is_question_applicable("university_name", {"university_admission_status": "Admission letter received"}) == True
+
+
+def test_question_details_is_deeply_read_only():
+    """Test that questions, their conditions and their options cannot be mutated."""
+    with pytest.raises(TypeError):
+        QUESTION_DETAILS["name"] = {}
+    with pytest.raises(TypeError):
+        QUESTION_DETAILS["education_gap_duration"]["condition"] = "education_gap == 'No'"
+    with pytest.raises(TypeError):
+        QUESTION_DETAILS["english_test"]["options"][0]["type"] = "Other"
+    with pytest.raises(AttributeError):
+        QUESTION_DETAILS["current_profession"]["options"].append("Retired")
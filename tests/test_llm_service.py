@@ -0,0 +1,133 @@
+# backend/tests/test_llm_service.py
+# Unit tests for suggestion streaming and batching
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from app.services import llm_service
+from app.services.llm_service import generate_suggestions_batch, iter_streamed_json_objects
+
+
+def parse(chunks):
+    """Collect every object yielded for the given stream chunks."""
+    return list(iter_streamed_json_objects(chunks))
+
+
+def test_objects_split_across_chunks():
+    """Test objects whose text is split at arbitrary chunk boundaries."""
+    text = '[{"title": "Improve CIBIL", "priority": "High"}, {"title": "Add collateral", "priority": "Low"}]'
+    expected = [
+        {"title": "Improve CIBIL", "priority": "High"},
+        {"title": "Add collateral", "priority": "Low"},
+    ]
+    assert parse([text]) == expected
+    assert parse(list(text)) == expected
+    assert parse([text[:17], text[17:50], text[50:]]) == expected
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ('[{"title": "Use {braces}"}]', [{"title": "Use {braces}"}]),
+        ('[{"title": "Close }"}]', [{"title": "Close }"}]),
+        ('[{"title": "Say \\"hi\\" {"}]', [{"title": 'Say "hi" {'}]),
+        ('[{"title": "Ends in backslash \\\\"}]', [{"title": "Ends in backslash \\"}]),
+    ],
+)
+def test_braces_and_quotes_inside_strings(text, expected):
+    """Test that braces and escaped quotes inside string values are not structural."""
+    assert parse([text]) == expected
+    assert parse(list(text)) == expected
+
+
+def test_nested_objects():
+    """Test that nested objects stay inside their top-level object."""
+    text = '[{"title": "A", "meta": {"score": {"value": 7}}}, {"title": "B"}]'
+    assert parse(list(text)) == [
+        {"title": "A", "meta": {"score": {"value": 7}}},
+        {"title": "B"},
+    ]
+
+
+def test_prose_and_fences_around_array():
+    """Test that markdown fences and prose around the array are ignored."""
+    text = 'Here are your suggestions:\n```json\n[{"title": "A"},\n {"title": "B"}]\n```\nGood luck!'
+    assert parse([text]) == [{"title": "A"}, {"title": "B"}]
+
+
+def test_malformed_object_is_skipped():
+    """Test that an object that fails to parse is dropped and parsing continues."""
+    text = '[{"title": "A"}, {"title": oops}, {"title": "C"}]'
+    assert parse(list(text)) == [{"title": "A"}, {"title": "C"}]
+
+
+def make_suggestions(tag, count=5):
+    """Build a valid suggestion list whose titles carry a tag."""
+    return [
+        {
+            "title": f"{tag} step {i}",
+            "description": "Do the thing.",
+            "priority": "high",
+            "timeframe": "1-2 weeks",
+            "impact": "Improves eligibility",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Serve a fixed batch answer and record single-profile fallbacks."""
+    state = {"content": "", "fallbacks": []}
+
+    def create(**kwargs):
+        message = SimpleNamespace(content=state["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def fallback(profile):
+        state["fallbacks"].append(profile)
+        return make_suggestions(f"fallback {profile['name']}")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_service, "OpenAI", lambda api_key: client)
+    monkeypatch.setattr(llm_service, "generate_profile_suggestions", fallback)
+    return state
+
+
+def test_batch_results_follow_input_order(fake_openai):
+    """Test that answers keyed by id are realigned with the input profiles."""
+    profiles = [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+    fake_openai["content"] = json.dumps(
+        {"2": make_suggestions("c"), "0": make_suggestions("a"), "1": make_suggestions("b")}
+    )
+    results = generate_suggestions_batch(profiles)
+    assert [r[0]["title"] for r in results] == ["a step 0", "b step 0", "c step 0"]
+    assert fake_openai["fallbacks"] == []
+
+
+def test_batch_falls_back_per_entry(fake_openai):
+    """Test that only missing or malformed entries are regenerated individually."""
+    profiles = [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+    fake_openai["content"] = json.dumps(
+        {"0": make_suggestions("a"), "2": make_suggestions("c", count=2)}
+    )
+    results = generate_suggestions_batch(profiles)
+    assert results[0][0]["title"] == "a step 0"
+    assert results[1][0]["title"] == "fallback b step 0"
+    assert results[2][0]["title"] == "fallback c step 0"
+    assert fake_openai["fallbacks"] == [{"name": "b"}, {"name": "c"}]
+
+
+def test_batch_unparseable_answer_falls_back_for_all(fake_openai):
+    """Test that an unparseable batch answer regenerates every profile."""
+    profiles = [{"name": "a"}, {"name": "b"}]
+    fake_openai["content"] = "Sorry, I cannot help with that."
+    results = generate_suggestions_batch(profiles)
+    assert [r[0]["title"] for r in results] == ["fallback a step 0", "fallback b step 0"]
+
+
+def test_batch_of_nothing():
+    """Test that an empty batch makes no calls."""
+    assert generate_suggestions_batch([]) == []
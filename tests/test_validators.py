@@ -16,87 +16,135 @@ from app.utils.validators import (
 )
 
 
-def test_validate_email():
+@pytest.mark.parametrize(
+    "email,expected",
+    [(None, True), ("test@example.com", True), ("invalid", False)],
+)
+def test_validate_email(email, expected):
     """Test email validation."""
-    assert validate_email(None) == True
-    assert validate_email("test@example.com") == True
-    assert validate_email("invalid") == False
+    assert validate_email(email) is expected
 
 
-def test_validate_phone():
+@pytest.mark.parametrize(
+    "phone,expected",
+    [(None, True), ("+919876543210", True), ("123", False)],
+)
+def test_validate_phone(phone, expected):
     """Test phone number validation."""
-    assert validate_phone(None) == True
-    assert validate_phone("+919876543210") == True
-    assert validate_phone("123") == False
+    assert validate_phone(phone) is expected
 
 
-def test_validate_score():
+@pytest.mark.parametrize(
+    "value,format_type,min_val,max_val,expected",
+    [
+        (None, "Percentage", 0, 100, True),
+        (85, "Percentage", 0, 100, True),
+        (7.5, "CGPA", 0, 10, True),
+        (150, "Percentage", 0, 100, False),
+    ],
+)
+def test_validate_score(value, format_type, min_val, max_val, expected):
     """Test score validation."""
-    assert validate_score(None, "Percentage", 0, 100) == True
-    assert validate_score(85, "Percentage", 0, 100) == True
-    assert validate_score(7.5, "CGPA", 0, 10) == True
-    assert validate_score(150, "Percentage", 0, 100) == False
-
-
-def test_validate_pincode():
+    assert validate_score(value, format_type, min_val, max_val) is expected
+
+
+@pytest.mark.parametrize(
+    "pincode,expected",
+    [
+        (None, True),
+        ("560066", True),
+        ("123", False),
+        ("56006a", False),
+        ("560066\n", False),
+    ],
+)
+def test_validate_pincode(pincode, expected):
     """Test pincode validation."""
-    assert validate_pincode(None) == True
-    assert validate_pincode("560066") == True
-    assert validate_pincode("123") == False
+    assert validate_pincode(pincode) is expected
 
 
-def test_validate_cibil_score():
+@pytest.mark.parametrize(
+    "score,expected",
+    [(None, True), ("720", True), ("200", False), ("abc", False), ("-750", False)],
+)
+def test_validate_cibil_score(score, expected):
     """Test CIBIL score validation."""
-    assert validate_cibil_score(None) == True
-    assert validate_cibil_score("720") == True
-    assert validate_cibil_score("200") == False
-    assert validate_cibil_score("abc") == False
-
-
-def test_validate_pan():
+    assert validate_cibil_score(score) is expected
+
+
+@pytest.mark.parametrize(
+    "pan,expected",
+    [
+        (None, True),
+        ("ABCDE1234F", True),
+        ("12345", False),
+        ("abcde1234f", False),
+        ("ABCDÉ1234F", False),
+    ],
+)
+def test_validate_pan(pan, expected):
     """Test PAN number validation."""
-    assert validate_pan(None) == True
-    assert validate_pan("ABCDE1234F") == True
-    assert validate_pan("12345") == False
+    assert validate_pan(pan) is expected
 
 
-def test_validate_aadhaar():
+@pytest.mark.parametrize(
+    "aadhaar,expected",
+    [(None, True), ("123456789012", True), ("12345", False), ("12345678901a", False)],
+)
+def test_validate_aadhaar(aadhaar, expected):
     """Test Aadhaar number validation."""
-    assert validate_aadhaar(None) == True
-    assert validate_aadhaar("123456789012") == True
-    assert validate_aadhaar("12345") == False
-
-
-def test_validate_student_id():
+    assert validate_aadhaar(aadhaar) is expected
+
+
+@pytest.mark.parametrize(
+    "student_id,expected",
+    [
+        (None, False),
+        ("", False),
+        ("STU123", True),
+        ("stu_123-abc", True),
+        ("123", True),
+        ("a" * 51, False),  # Too long
+        ("stu@123", False),  # Invalid character
+    ],
+)
+def test_validate_student_id(student_id, expected):
     """Test student ID validation."""
-    assert validate_student_id(None) == False
-    assert validate_student_id("") == False
-    assert validate_student_id("STU123") == True
-    assert validate_student_id("stu_123-abc") == True
-    assert validate_student_id("123") == True
-    assert validate_student_id("a" * 51) == False  # Too long
-    assert validate_student_id("stu@123") == False  # Invalid character
-
-
-def test_validate_document_type():
+    assert validate_student_id(student_id) is expected
+
+
+@pytest.mark.parametrize(
+    "document_type,expected",
+    [
+        (None, False),
+        ("", False),
+        ("academic_transcript", True),
+        ("passport", True),
+        ("invalid_type", False),
+        ("PASSPORT", True),  # Case insensitive
+        ("Academic_Transcript", True),  # Case insensitive
+    ],
+)
+def test_validate_document_type(document_type, expected):
     """Test document type validation."""
-    assert validate_document_type(None) == False
-    assert validate_document_type("") == False
-    assert validate_document_type("academic_transcript") == True
-    assert validate_document_type("passport") == True
-    assert validate_document_type("invalid_type") == False
-    assert validate_document_type("PASSPORT") == True  # Case insensitive
-    assert validate_document_type("Academic_Transcript") == True  # Case insensitive
-
-
-def test_validate_file_name():
+    assert validate_document_type(document_type) is expected
+
+
+@pytest.mark.parametrize(
+    "file_name,expected",
+    [
+        (None, False),
+        ("", False),
+        ("document.pdf", True),
+        ("my_document.docx", True),
+        ("image.jpg", True),
+        ("Scan.PDF", True),
+        ("../../../etc/passwd", False),  # Path traversal
+        ("document/subdir.pdf", False),  # Directory separator
+        ("document.exe", False),  # Invalid extension
+        ("a" * 256, False),  # Too long
+    ],
+)
+def test_validate_file_name(file_name, expected):
     """Test file name validation."""
-    assert validate_file_name(None) == False
-    assert validate_file_name("") == False
-    assert validate_file_name("document.pdf") == True
-    assert validate_file_name("my_document.docx") == True
-    assert validate_file_name("image.jpg") == True
-    assert validate_file_name("../../../etc/passwd") == False  # Path traversal
-    assert validate_file_name("document/subdir.pdf") == False  # Directory separator
-    assert validate_file_name("document.exe") == False  # Invalid extension
-    assert validate_file_name("a" * 256) == False  # Too long
+    assert validate_file_name(file_name) is expected
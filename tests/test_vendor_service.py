@@ -0,0 +1,128 @@
+# backend/tests/test_vendor_service.py
+# Regression tests for indexed vendor matching
+
+import itertools
+
+import pytest
+from app.services.vendor_service import (
+    build_vendor_index,
+    calculate_foir,
+    format_vendor_match,
+    match_vendors,
+    parse_percentage,
+)
+from app.utils.vendors_list import VENDORS
+
+
+def reference_match_vendors(student_profile, vendors):
+    """Straightforward per-vendor matching, as it worked before the vendor index."""
+    try:
+        if not student_profile.get("education_details", {}).get("university_name", []):
+            return [], "No university specified in profile"
+        if not any(v.get("active", True) for v in vendors):
+            return [], "No vendors found supporting the specified universities"
+
+        education = student_profile.get("education_details", {})
+        co_applicant = student_profile.get("co_applicant_details", {})
+        valid_vendors = []
+        for vendor in vendors:
+            if not vendor.get("active", True):
+                continue
+            criteria = vendor.get("criteria", {})
+            min_score = criteria.get("min_academic_score_percentage", 0)
+            if (
+                education.get("marks_10th", {}).get("value", 0) < min_score
+                or education.get("marks_12th", {}).get("value", 0) < min_score
+            ):
+                continue
+            if education.get("educational_backlogs", 0) > criteria.get(
+                "max_educational_backlogs", float("inf")
+            ):
+                continue
+            english_test = education.get("english_test", {})
+            if english_test:
+                key = f"min_{english_test.get('type').lower()}_score"
+                if criteria.get(key) and english_test.get("score", 0) < criteria[key]:
+                    continue
+            foir_limit = criteria.get("Foir", criteria.get("foir", "75%"))
+            current_foir = calculate_foir(
+                co_applicant.get("co_applicant_income_amount", {}).get("amount", 0),
+                co_applicant.get("co_applicant_existing_loan_emi_amount", {}).get("amount", 0),
+                foir_limit,
+            )
+            if current_foir > parse_percentage(foir_limit) * 100:
+                continue
+            valid_vendors.append(vendor)
+
+        if not valid_vendors:
+            return [], "No vendors matched all criteria"
+        return (
+            [format_vendor_match(v, student_profile) for v in valid_vendors],
+            "Successfully matched vendors",
+        )
+    except Exception as e:
+        return [], f"Failed to match vendors: {str(e)}"
+
+
+def build_profiles():
+    """Build profiles spanning the academic, backlog, test and FOIR branches."""
+    profiles = []
+    for marks, backlogs, test, income, emi, universities in itertools.product(
+        [(0, 50), (55, 70), (65, 70), (90, 90)],
+        [0, 3, 10],
+        [None, ("IELTS", 5), ("IELTS", 7.5), ("TOEFL", 70), ("PTE", 80)],
+        [0, 50000, 200000],
+        [0, 30000],
+        [[], ["MIT"]],
+    ):
+        education = {
+            "marks_10th": {"value": marks[0]},
+            "marks_12th": {"value": marks[1]},
+            "educational_backlogs": backlogs,
+            "university_name": universities,
+        }
+        if test:
+            education["english_test"] = {"type": test[0], "score": test[1]}
+        profiles.append(
+            {
+                "student_id": "s",
+                "education_details": education,
+                "co_applicant_details": {
+                    "co_applicant_income_amount": {"amount": income},
+                    "co_applicant_existing_loan_emi_amount": {"amount": emi},
+                },
+                "loan_details": {"collateral_available": "Yes" if income else "No"},
+            }
+        )
+    return profiles
+
+
+PROFILES = build_profiles()
+# Vendors with a numeric academic minimum; a None minimum makes both versions fail identically
+COMPARABLE_VENDORS = [
+    v for v in VENDORS if v.get("criteria", {}).get("min_academic_score_percentage", 0) is not None
+]
+# Some vendors deactivated, to cover the active flag
+CUSTOM_VENDORS = [
+    dict(v, active=False) if i % 3 == 0 else v for i, v in enumerate(COMPARABLE_VENDORS)
+]
+
+
+@pytest.mark.parametrize(
+    "vendors",
+    [VENDORS, COMPARABLE_VENDORS, CUSTOM_VENDORS],
+    ids=["builtin", "comparable", "custom"],
+)
+def test_match_vendors_matches_reference(vendors):
+    """Test that indexed matching returns exactly what per-vendor matching returns."""
+    for profile in PROFILES:
+        assert match_vendors(profile, vendors) == reference_match_vendors(profile, vendors)
+
+
+def test_match_vendors_with_prebuilt_index():
+    """Test that a caller-supplied index gives the same results."""
+    index = build_vendor_index(CUSTOM_VENDORS)
+    for profile in PROFILES:
+        assert match_vendors(profile, CUSTOM_VENDORS, vendor_index=index) == (
+            reference_match_vendors(profile, CUSTOM_VENDORS)
+        )